@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 
@@ -23,7 +24,9 @@ async def chat_endpoint(
     try:
         session_id = request.session_id or str(uuid.uuid4())
 
-        result = container.retrieval_chain.run(
+        # 检索链全程是同步I/O（MongoDB、Qdrant、LLM），放到线程池避免阻塞事件循环
+        result = await asyncio.to_thread(
+            container.retrieval_chain.run,
             question=request.message,
             session_id=session_id,
             model=request.model,
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import tempfile
 import uuid
@@ -95,7 +96,8 @@ async def _process_upload(
         if not named_path.exists():
             named_path.symlink_to(tmp_path)
 
-        result = import_service.import_file(named_path)
+        # 导入是同步阻塞流程，放到线程里避免卡住事件循环
+        result = await asyncio.to_thread(import_service.import_file, named_path)
 
         if result["success"]:
             job["status"] = "completed"
@@ -151,7 +153,9 @@ async def list_files(
 ) -> dict:
     """从 MongoDB 读取已入库的文件列表，不受服务重启影响。"""
     try:
-        collections = container.import_service.mongo_store.get_all_collections()
+        collections = await asyncio.to_thread(
+            container.import_service.mongo_store.get_all_collections
+        )
         files = [
             {
                 "id": c.id,
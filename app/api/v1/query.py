@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import uuid
 
@@ -23,8 +24,9 @@ async def query_endpoint(
         # 生成会话ID（如果未提供）
         session_id = request.session_id or str(uuid.uuid4())
 
-        # 执行RAG检索
-        result = container.retrieval_chain.run(
+        # 执行RAG检索：检索链全程是同步I/O，放到线程池避免阻塞事件循环
+        result = await asyncio.to_thread(
+            container.retrieval_chain.run,
             question=request.question,
             session_id=session_id,
             template_name=request.template_name,
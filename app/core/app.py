@@ -1,7 +1,9 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 from config.settings import app_config
 from app.api.v1.router import router as api_v1_router
@@ -25,7 +27,9 @@ def create_app(container: AppContainer | None = None) -> FastAPI:
     logger = setup_logger(
         name="echo-intellect",
         log_file="logs/app.log" if not app_config.is_production else None,
-        level=getattr(__import__("logging"), app_config.log_level),
+        level=logging.getLevelNamesMapping().get(
+            app_config.log_level.upper(), logging.INFO
+        ),
     )
 
     logger.info("Echo Intellect RAG 系统启动中...")
@@ -36,6 +40,7 @@ def create_app(container: AppContainer | None = None) -> FastAPI:
         description="智能问答系统（RAG）",
         version="1.0.0",
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
     app.state.container = container or create_container()
 
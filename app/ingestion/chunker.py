@@ -35,40 +35,48 @@ class TokenAwareChunker:
         if not paragraphs:
             return []
 
+        # 一次批量编码所有段落，后续合并、重叠都复用这里的token数，不再重复编码。
+        paragraph_tokens = self.count_tokens_batch(paragraphs)
+
         chunks: list[str] = []
-        current_parts: list[str] = []
+        current_parts: list[tuple[str, int]] = []
         current_tokens = 0
 
-        for paragraph in paragraphs:
-            paragraph_tokens = self.count_tokens(paragraph)
-            if paragraph_tokens > self.max_tokens:
+        for paragraph, tokens in zip(paragraphs, paragraph_tokens):
+            if tokens > self.max_tokens:
                 self._flush_current(chunks, current_parts)
                 current_parts = []
                 current_tokens = 0
                 chunks.extend(self._split_large_text(paragraph))
                 continue
 
-            if current_parts and current_tokens + paragraph_tokens > self.target_tokens:
+            if current_parts and current_tokens + tokens > self.target_tokens:
                 self._flush_current(chunks, current_parts)
                 current_parts, current_tokens = self._build_overlap(current_parts)
 
-            current_parts.append(paragraph)
-            current_tokens += paragraph_tokens
+            current_parts.append((paragraph, tokens))
+            current_tokens += tokens
 
         self._flush_current(chunks, current_parts)
 
+        chunks = [chunk for chunk in chunks if chunk]
         result = [
-            TextChunk(content=chunk, index=index, tokens=self.count_tokens(chunk))
-            for index, chunk in enumerate(chunks)
-            if chunk
+            TextChunk(content=chunk, index=index, tokens=tokens)
+            for index, (chunk, tokens) in enumerate(
+                zip(chunks, self.count_tokens_batch(chunks))
+            )
         ]
-        logger.info("文档切分完成: %s chunks", len(result))
+        logger.debug("文档切分完成: %s chunks", len(result))
         return result
 
     def count_tokens(self, text: str) -> int:
         """计算文本token数。"""
         return len(self.encoding.encode(text))
 
+    def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        """批量计算token数，tiktoken在原生线程池里并行编码。"""
+        return [len(token_ids) for token_ids in self.encoding.encode_batch(texts)]
+
     def _split_large_text(self, text: str) -> list[str]:
         """大段落按token硬切，保证不超过上限。"""
         token_ids = self.encoding.encode(text)
@@ -82,22 +90,23 @@ class TokenAwareChunker:
 
         return chunks
 
-    def _build_overlap(self, parts: list[str]) -> tuple[list[str], int]:
+    def _build_overlap(
+        self, parts: list[tuple[str, int]]
+    ) -> tuple[list[tuple[str, int]], int]:
         """保留上一块尾部，减少上下文断裂。"""
-        overlap_parts: list[str] = []
+        overlap_parts: list[tuple[str, int]] = []
         overlap_tokens = 0
 
-        for part in reversed(parts):
-            part_tokens = self.count_tokens(part)
+        for part, part_tokens in reversed(parts):
             if overlap_tokens + part_tokens > self.overlap_tokens:
                 break
 
-            overlap_parts.insert(0, part)
+            overlap_parts.insert(0, (part, part_tokens))
             overlap_tokens += part_tokens
 
         return overlap_parts, overlap_tokens
 
     @staticmethod
-    def _flush_current(chunks: list[str], parts: list[str]) -> None:
+    def _flush_current(chunks: list[str], parts: list[tuple[str, int]]) -> None:
         if parts:
-            chunks.append("\n".join(parts).strip())
+            chunks.append("\n".join(part for part, _ in parts).strip())
@@ -1,13 +1,22 @@
 import logging
 import uuid
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 
+import numpy as np
+
 from app.llms.embeddings import embedding_manager
-from app.models.data_models import Data, EmbeddingVector
+from app.models.data_models import Data
 from app.stores.qdrant import QdrantVectorStore
+from config.settings import app_config
 
 logger = logging.getLogger(__name__)
 
+SUB_VECTOR_LENGTH = 512
+VECTOR_ID_NAMESPACE = uuid.UUID("6f1c8c1e-4f7a-4c57-9d51-3b0a6d0e2a41")
+
 
 @dataclass(frozen=True)
 class VectorJob:
@@ -22,56 +31,142 @@ class VectorJob:
 class EmbeddingIndexer:
     """负责生成embedding并写入Qdrant。"""
 
-    def __init__(self, qdrant_store: QdrantVectorStore, batch_size: int = 16):
+    def __init__(
+        self,
+        qdrant_store: QdrantVectorStore,
+        batch_size: int | None = None,
+        insert_batch_size: int | None = None,
+        max_concurrency: int | None = None,
+        sub_vector_min_length: int | None = None,
+    ):
         self.qdrant_store = qdrant_store
-        self.batch_size = batch_size
+        self.batch_size = batch_size or app_config.embedding_batch_size
+        self.insert_batch_size = insert_batch_size or app_config.vector_insert_batch_size
+        self.max_concurrency = max_concurrency or app_config.embedding_max_concurrency
+        self.sub_vector_min_length = (
+            sub_vector_min_length or app_config.sub_vector_min_length
+        )
 
     def index_data(self, data_list: list[Data]) -> dict[str, list[str]]:
         """批量向量化并返回 data_id -> vector_ids。"""
         vector_map: dict[str, list[str]] = {data.id: [] for data in data_list}
         jobs = self._build_jobs(data_list)
-
-        for start in range(0, len(jobs), self.batch_size):
-            batch = jobs[start : start + self.batch_size]
-            embeddings = embedding_manager.embed_texts([job.text for job in batch])
-            vectors = [
-                EmbeddingVector(
-                    id=job.id,
-                    data_id=job.data_id,
-                    vector=embedding,
-                    model=embedding_manager.model,
-                )
-                for job, embedding in zip(batch, embeddings)
-            ]
-
-            if not self.qdrant_store.insert_vectors(vectors):
-                raise RuntimeError("Qdrant向量写入失败")
-
-            for job in batch:
-                vector_map[job.data_id].append(job.id)
+        pending_jobs: list[VectorJob] = []
+        pending_vectors: list[np.ndarray] = []
+
+        batches = [
+            jobs[start : start + self.batch_size]
+            for start in range(0, len(jobs), self.batch_size)
+        ]
+
+        # 嵌入请求并发执行，主线程按顺序取结果、攒够一批再写Qdrant，写入与后续嵌入重叠。
+        # 中间批次不等待落盘，只有最后一批 wait=True：Qdrant按顺序应用更新，
+        # 最后一批可见时之前的批次也已生效。
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            for batch, vectors in self._embed_ahead(executor, batches):
+                pending_jobs.extend(batch)
+                pending_vectors.append(vectors)
+                if len(pending_jobs) <= self.insert_batch_size:
+                    continue
+
+                matrix = np.concatenate(pending_vectors)
+                while len(pending_jobs) > self.insert_batch_size:
+                    size = self.insert_batch_size
+                    self._insert(pending_jobs[:size], matrix[:size], vector_map, wait=False)
+                    pending_jobs = pending_jobs[size:]
+                    matrix = matrix[size:]
+                pending_vectors = [matrix]
+
+        if pending_jobs:
+            self._insert(
+                pending_jobs, np.concatenate(pending_vectors), vector_map, wait=True
+            )
 
         logger.info("向量索引完成: data=%s, vectors=%s", len(data_list), len(jobs))
         return vector_map
 
+    def _embed_ahead(
+        self,
+        executor: ThreadPoolExecutor,
+        batches: list[list[VectorJob]],
+    ) -> Iterator[tuple[list[VectorJob], np.ndarray]]:
+        """按顺序产出嵌入结果，最多提前 2*max_concurrency 批。
+
+        写入变慢时已完成的嵌入不会无限堆积；写入失败时取消尚未开始的批次，
+        不再为注定丢弃的数据调用嵌入接口。
+        """
+        window = 2 * self.max_concurrency
+        in_flight: deque[tuple[list[VectorJob], Future]] = deque()
+
+        try:
+            for batch in batches:
+                in_flight.append((batch, executor.submit(self._embed_batch, batch)))
+                if len(in_flight) >= window:
+                    done_batch, future = in_flight.popleft()
+                    yield done_batch, future.result()
+
+            while in_flight:
+                done_batch, future = in_flight.popleft()
+                yield done_batch, future.result()
+        finally:
+            for _, future in in_flight:
+                future.cancel()
+
+    @staticmethod
+    def _embed_batch(batch: list[VectorJob]) -> np.ndarray:
+        # 批内相同文本只请求一次嵌入，再按任务顺序取行
+        positions: dict[str, int] = {}
+        for job in batch:
+            positions.setdefault(job.text, len(positions))
+
+        embeddings = embedding_manager.embed_array(list(positions))
+        return embeddings[[positions[job.text] for job in batch]]
+
+    def _insert(
+        self,
+        jobs: list[VectorJob],
+        vectors: np.ndarray,
+        vector_map: dict[str, list[str]],
+        wait: bool,
+    ) -> None:
+        inserted = self.qdrant_store.insert_vector_batch(
+            ids=[job.id for job in jobs],
+            data_ids=[job.data_id for job in jobs],
+            vectors=vectors,
+            model=embedding_manager.model,
+            wait=wait,
+        )
+        if not inserted:
+            raise RuntimeError("Qdrant向量写入失败")
+
+        for job in jobs:
+            vector_map[job.data_id].append(job.id)
+
+    @staticmethod
+    def _vector_id(data_id: str, vector_type: str) -> str:
+        # 向量ID由data_id和向量类型确定，中断后重跑会覆盖已写入的点而不是重复插入
+        return str(uuid.uuid5(VECTOR_ID_NAMESPACE, f"{data_id}:{vector_type}"))
+
     def _build_jobs(self, data_list: list[Data]) -> list[VectorJob]:
         jobs = []
         for data in data_list:
             jobs.append(
                 VectorJob(
-                    id=str(uuid.uuid4()),
+                    id=self._vector_id(data.id, "main"),
                     data_id=data.id,
                     text=data.content,
                     vector_type="main",
                 )
             )
 
-            # 长文本保留一个子向量，提高局部召回。
-            if len(data.content) > 512:
+            # 长文本保留一个子向量，提高局部召回；只比前缀略长时子向量与主向量
+            # 几乎相同，跳过以省一次嵌入。
+            if len(data.content) > self.sub_vector_min_length:
                 jobs.append(
                     VectorJob(
-                        id=str(uuid.uuid4()),
+                        id=self._vector_id(data.id, "sub"),
                         data_id=data.id,
-                        text=data.content[:512],
+                        text=data.content[:SUB_VECTOR_LENGTH],
                         vector_type="sub",
                     )
                 )
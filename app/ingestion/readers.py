@@ -1,14 +1,23 @@
+import codecs
 import logging
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Iterable
 
+import charset_normalizer
 import fitz
 
 logger = logging.getLogger(__name__)
 
 SUPPORTED_EXTENSIONS = {".txt", ".md", ".pdf"}
 
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_DETECT_PREFIX_BYTES = 64 * 1024
+
 
 @dataclass(frozen=True)
 class SourceDocument:
@@ -35,30 +44,74 @@ class FileReader:
         logger.warning("不支持的文件格式: %s", suffix)
         return None
 
+    def list_files(self, data_dir: str) -> list[Path]:
+        """列出目录下所有支持格式的文件。"""
+        return [
+            file_path
+            for ext in sorted(SUPPORTED_EXTENSIONS)
+            for file_path in sorted(Path(data_dir).glob(f"*{ext}"))
+        ]
+
     def read_directory(self, data_dir: str) -> list[SourceDocument]:
         """读取目录下所有支持格式的文件。"""
         documents = []
-        for ext in sorted(SUPPORTED_EXTENSIONS):
-            for file_path in sorted(Path(data_dir).glob(f"*{ext}")):
-                content = self.read_file(file_path)
-                if content:
-                    documents.append(SourceDocument(path=file_path, content=content))
+        for file_path in self.list_files(data_dir):
+            content = self.read_file(file_path)
+            if content:
+                documents.append(SourceDocument(path=file_path, content=content))
         return documents
 
     def _read_text(self, file_path: Path) -> str | None:
-        """按常见编码读取文本文件。"""
+        """只读一次字节，识别编码后解码。"""
+        try:
+            raw = file_path.read_bytes()
+        except Exception as e:
+            logger.error("读取文件失败: %s, error=%s", file_path, e)
+            return None
+
+        decoded = self._decode(raw)
+        if decoded is None:
+            logger.error("所有编码均失败: %s", file_path)
+            return None
+
+        content, encoding = decoded
+        logger.debug("使用 %s 编码读取: %s", encoding, file_path.name)
+        return content
+
+    def _decode(self, raw: bytes) -> tuple[str, str] | None:
+        """BOM > UTF-8 > 候选编码逐个严格解码 > charset-normalizer（只看前64KB）。
+
+        短文本上探测结果不可靠（GBK 常被判成 big5/cp949），所以探测只兜底候选编码都失败的情况，
+        且猜出的编码也必须能严格解码全文才采用。
+        """
+        for bom, encoding in _BOMS:
+            if raw.startswith(bom):
+                try:
+                    return raw.decode(encoding), encoding
+                except UnicodeDecodeError:
+                    break
+
+        try:
+            return raw.decode("utf-8"), "utf-8"
+        except UnicodeDecodeError:
+            pass
+
         for encoding in self.encodings:
+            # 上面已经试过UTF-8，候选里的utf-8（含utf8等别名）不再重复解码全文
+            if codecs.lookup(encoding).name == "utf-8":
+                continue
             try:
-                content = file_path.read_text(encoding=encoding)
-                logger.info("使用 %s 编码读取: %s", encoding, file_path.name)
-                return content
+                return raw.decode(encoding), encoding
             except UnicodeDecodeError:
                 continue
-            except Exception as e:
-                logger.error("读取文件失败: %s, error=%s", file_path, e)
-                return None
-        logger.error("所有编码均失败: %s", file_path)
-        return None
+
+        match = charset_normalizer.from_bytes(raw[:_DETECT_PREFIX_BYTES]).best()
+        if match is None:
+            return None
+        try:
+            return raw.decode(match.encoding), match.encoding
+        except UnicodeDecodeError:
+            return None
 
     def _read_pdf(self, file_path: Path) -> str | None:
         """用 PyMuPDF 提取 PDF 全文。"""
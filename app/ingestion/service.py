@@ -1,12 +1,14 @@
+import asyncio
 import logging
 import time
 import uuid
+from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from app.ingestion.chunker import TextChunk, TokenAwareChunker
 from app.ingestion.indexer import EmbeddingIndexer
-from app.ingestion.readers import FileReader
+from app.ingestion.readers import FileReader, SourceDocument
 from app.llms.embeddings import embedding_manager
 from app.models.data_models import Collection, Data, Dataset
 from app.stores.mongo import MongoMetadataStore
@@ -14,6 +16,8 @@ from app.stores.qdrant import QdrantVectorStore
 
 logger = logging.getLogger(__name__)
 
+PENDING_FLUSH_SIZE = 500
+
 
 class DataImportService:
     """导入编排服务，只负责把读取、切块、入库、索引串起来。"""
@@ -68,20 +72,26 @@ class DataImportService:
             dataset = self._get_or_create_dataset(dataset_name)
             result["dataset_id"] = dataset.id
 
-            documents = self.reader.read_directory(data_dir)
-            if not documents:
-                result["error"] = f"在 {data_dir} 目录下未找到txt文件"
+            file_paths = self.reader.list_files(data_dir)
+            if not file_paths:
+                result["error"] = f"在 {data_dir} 目录下未找到支持的文件"
                 return result
 
-            for document in documents:
-                file_result = self._import_document(document.path, document.content, dataset)
-                if file_result["success"]:
-                    result["files_processed"] += 1
-                    result["data_created"] += file_result["data_created"]
-                    result["vectors_created"] += file_result["vectors_created"]
-                else:
-                    logger.error("文件导入失败: %s", file_result["error"])
-
+            # 读取和入库/向量化流水线并行：处理当前文件时预读后续文件。
+            # 导入期间暂停HNSW构建，避免每批写入都修改索引图。
+            queue: asyncio.Queue[SourceDocument | None] = asyncio.Queue(maxsize=2)
+            with self.qdrant_store.bulk_import_mode():
+                await asyncio.gather(
+                    self._read_documents(file_paths, queue),
+                    self._import_queued_documents(queue, dataset, result),
+                )
+
+            logger.info(
+                "目录导入完成: files=%s, data=%s, vectors=%s",
+                result["files_processed"],
+                result["data_created"],
+                result["vectors_created"],
+            )
             result["success"] = True
             return result
 
@@ -90,6 +100,38 @@ class DataImportService:
             result["error"] = str(e)
             return result
 
+    async def _read_documents(
+        self,
+        file_paths: list[Path],
+        queue: asyncio.Queue[SourceDocument | None],
+    ) -> None:
+        try:
+            for file_path in file_paths:
+                content = await asyncio.to_thread(self.reader.read_file, file_path)
+                if content:
+                    await queue.put(SourceDocument(path=file_path, content=content))
+        finally:
+            await queue.put(None)
+
+    async def _import_queued_documents(
+        self,
+        queue: asyncio.Queue[SourceDocument | None],
+        dataset: Dataset,
+        result: dict[str, Any],
+    ) -> None:
+        while (document := await queue.get()) is not None:
+            try:
+                file_result = await asyncio.to_thread(
+                    self._import_document, document.path, document.content, dataset
+                )
+            except Exception as e:
+                logger.error("文件导入失败: %s, error=%s", document.path.name, e)
+                continue
+
+            result["files_processed"] += 1
+            result["data_created"] += file_result["data_created"]
+            result["vectors_created"] += file_result["vectors_created"]
+
     def import_file(
         self,
         file_path: Path,
@@ -135,11 +177,10 @@ class DataImportService:
         processed_data = 0
 
         for collection in collections:
-            data_list = self.mongo_store.get_data_by_collection(collection.id)
-            total_data += len(data_list)
-            processed_data += sum(
-                1 for data in data_list if data.metadata.get("processed", False)
-            )
+            for data in self.mongo_store.iter_data_by_collection(collection.id):
+                total_data += 1
+                if data.metadata.get("processed", False):
+                    processed_data += 1
 
         return {
             "dataset_id": dataset_id,
@@ -157,18 +198,32 @@ class DataImportService:
         content: str,
         dataset: Dataset,
     ) -> dict[str, Any]:
-        chunks = self.chunker.split(content)
         collection = self._get_or_create_collection(file_path, dataset.id)
 
+        # 已导入的文件只补齐未完成向量化的数据，不再重新切块、入库
         existing_data = self.mongo_store.get_data_by_collection(collection.id)
         if existing_data:
-            logger.info("文件已导入，跳过重复导入: %s", file_path.name)
+            pending_data = [
+                data for data in existing_data if not data.metadata.get("processed")
+            ]
+            if not pending_data:
+                logger.info("文件已导入，跳过重复导入: %s", file_path.name)
+                return {
+                    "success": True,
+                    "data_created": 0,
+                    "vectors_created": 0,
+                }
+
+            logger.info("补齐未完成数据: %s, %s", file_path.name, len(pending_data))
+            vector_map = self.indexer.index_data(pending_data)
+            self._mark_indexed(pending_data, vector_map)
             return {
                 "success": True,
                 "data_created": 0,
-                "vectors_created": 0,
+                "vectors_created": sum(len(ids) for ids in vector_map.values()),
             }
 
+        chunks = self.chunker.split(content)
         data_list = self._store_chunks(chunks, collection)
         vector_map = self.indexer.index_data(data_list)
         self._mark_indexed(data_list, vector_map)
@@ -196,7 +251,7 @@ class DataImportService:
         return dataset
 
     def _get_or_create_collection(self, file_path: Path, dataset_id: str) -> Collection:
-        existing = self._find_collection(dataset_id, file_path.stem)
+        existing = self.mongo_store.get_collection_by_name(dataset_id, file_path.stem)
         if existing:
             return existing
 
@@ -214,12 +269,6 @@ class DataImportService:
 
         return collection
 
-    def _find_collection(self, dataset_id: str, name: str) -> Collection | None:
-        for collection in self.mongo_store.get_collections_by_dataset(dataset_id):
-            if collection.name == name:
-                return collection
-        return None
-
     def _store_chunks(
         self,
         chunks: list[TextChunk],
@@ -241,10 +290,11 @@ class DataImportService:
                 sequence=chunk.index,
                 tokens=chunk.tokens,
             )
-            if not self.mongo_store.create_data(data):
-                raise RuntimeError(f"数据块创建失败: {collection.name}#{chunk.index}")
             data_list.append(data)
 
+        if not self.mongo_store.bulk_create_data(data_list):
+            raise RuntimeError(f"数据块创建失败: {collection.name}")
+
         return data_list
 
     def _mark_indexed(
@@ -256,7 +306,12 @@ class DataImportService:
             data.vector_ids = vector_map.get(data.id, [])
             data.metadata["processed"] = True
             data.metadata["vector_count"] = len(data.vector_ids)
-            self.mongo_store.update_data(data.id, data)
+
+        # 只写变化的字段，不回写整行内容
+        if not self.mongo_store.mark_processed(
+            {data.id: data.vector_ids for data in data_list}
+        ):
+            raise RuntimeError("数据向量状态更新失败")
 
     def _update_stats(
         self,
@@ -266,15 +321,21 @@ class DataImportService:
     ) -> None:
         data_count = len(data_list)
         total_tokens = sum(data.tokens for data in data_list)
-        self.mongo_store.update_collection_stats(collection_id, data_count, total_tokens)
-        self.mongo_store.update_dataset_stats(dataset_id, data_count, total_tokens)
+        now = datetime.now()
+        self.mongo_store.update_collection_stats(
+            collection_id, data_count, total_tokens, now=now
+        )
+        self.mongo_store.update_dataset_stats(dataset_id, data_count, total_tokens, now=now)
 
     async def _process_pending_data(self) -> None:
-        pending_data = self.mongo_store.get_all_pending_data()
-        if not pending_data:
+        # 每段重新查询未处理数据：嵌入一段可能很久，长开的游标会超过服务端空闲超时被回收。
+        # 段内落完状态后这些行不再命中查询，内存只占一段，中途失败时已完成的段不必重做
+        processed = 0
+        while batch := self.mongo_store.get_pending_data_batch(PENDING_FLUSH_SIZE):
+            vector_map = self.indexer.index_data(batch)
+            self._mark_indexed(batch, vector_map)
+            processed += len(batch)
+            logger.info("处理未完成数据: %s", processed)
+
+        if not processed:
             logger.info("没有未处理的数据")
-            return
-
-        logger.info("处理未完成数据: %s", len(pending_data))
-        vector_map = self.indexer.index_data(pending_data)
-        self._mark_indexed(pending_data, vector_map)
@@ -1,6 +1,8 @@
+import base64
 import logging
 from typing import List, Optional
 
+import numpy as np
 from langchain_core.embeddings import Embeddings
 from openai import OpenAI
 
@@ -38,7 +40,32 @@ class OpenAIEmbeddings(Embeddings):
             )
             embeddings = [item.embedding for item in response.data]
 
-            logger.debug(f"成功生成 {len(embeddings)} 个文档嵌入向量")
+            logger.debug("成功生成 %d 个文档嵌入向量", len(embeddings))
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"生成文档嵌入向量失败: {e}")
+            raise
+
+    def embed_documents_array(self, texts: List[str]) -> np.ndarray:
+        """批量生成文档嵌入向量，返回 (N, dim) 的float32矩阵
+
+        以base64接收原始字节，直接映射为ndarray，省去逐个float的JSON解析和列表构造。
+        """
+        try:
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts,
+                encoding_format="base64",
+            )
+            embeddings = np.vstack(
+                [
+                    np.frombuffer(base64.b64decode(item.embedding), dtype=np.float32)
+                    for item in response.data
+                ]
+            )
+
+            logger.debug("成功生成 %d 个文档嵌入向量", len(embeddings))
             return embeddings
 
         except Exception as e:
@@ -53,7 +80,7 @@ class OpenAIEmbeddings(Embeddings):
                 input=text,
             )
             embedding = response.data[0].embedding
-            logger.debug(f"成功生成查询嵌入向量，维度: {len(embedding)}")
+            logger.debug("成功生成查询嵌入向量，维度: %d", len(embedding))
             return embedding
 
         except Exception as e:
@@ -122,6 +149,13 @@ class EmbeddingManager:
 
         return self.embeddings.embed_documents(texts)
 
+    def embed_array(self, texts: List[str]) -> np.ndarray:
+        """批量文本嵌入，返回 (N, dim) 的ndarray"""
+        if not self.embeddings:
+            raise RuntimeError("嵌入模型未初始化")
+
+        return self.embeddings.embed_documents_array(texts)
+
     def get_dimension(self) -> int:
         """获取向量维度"""
         if self.dimension is None:
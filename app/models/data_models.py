@@ -62,6 +62,11 @@ class Data(BaseModel):
     created_at: datetime = Field(default_factory=datetime.now, description="创建时间")
     updated_at: datetime = Field(default_factory=datetime.now, description="更新时间")
 
+    def to_bson_dict(self) -> Dict[str, Any]:
+        """写库用的文档：字段都是BSON原生类型，浅拷贝即可，省去model_dump的逐字段序列化。
+        不做缓存，实例被修改后下一次写入仍是最新值"""
+        return dict(self.__dict__)
+
 
 class EmbeddingVector(BaseModel):
     """向量数据模型"""
@@ -125,8 +130,13 @@ class ConversationTurn(BaseModel):
     session_id: str = Field(description="会话ID")
     question: str = Field(description="用户问题")
     answer: str = Field(description="系统回答")
-    retrieved_chunks: List[RetrievalResult] = Field(
-        default_factory=list, description="检索到的内容"
+    chunk_refs: List[str] = Field(
+        default_factory=list, description="检索内容引用（chunks_by_turn集合中的ID）"
+    )
+    retrieved_chunks: List[Dict[str, Any]] = Field(
+        default_factory=list,
+        exclude=True,
+        description="检索到的内容，仅按需加载，不随对话文档存储",
     )
     timestamp: datetime = Field(default_factory=datetime.now, description="时间戳")
 
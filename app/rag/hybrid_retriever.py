@@ -1,5 +1,6 @@
 import logging
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 from app.models.data_models import RetrievalResult, Query
 from app.llms.embeddings import embedding_manager
@@ -9,6 +10,9 @@ from app.stores.qdrant import qdrant_store
 
 logger = logging.getLogger()
 
+# 检索链路只用到这些字段，不拉取vector_ids等大数组
+RETRIEVAL_FIELDS = ["id", "collection_id", "content", "title", "tokens", "metadata"]
+
 
 class LexicalRetriever:
     """基于MongoDB全文索引的词法检索器。"""
@@ -18,7 +22,8 @@ class LexicalRetriever:
         try:
             data_list = mongo_store.search_data_by_content(
                 query=query,
-                limit=top_k
+                limit=top_k,
+                fields=RETRIEVAL_FIELDS
             )
 
             results = []
@@ -70,15 +75,21 @@ class EmbeddingRetriever:
             logger.error(f"初始化嵌入向量检索器失败: {e}")
             raise
     
-    def search(self, query: str, top_k: int = 10) -> List[RetrievalResult]:
-        """向量搜索"""
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        query_vector: Optional[List[float]] = None
+    ) -> List[RetrievalResult]:
+        """向量搜索，调用方已批量生成查询向量时可直接传入"""
         try:
             if not self.initialized:
                 logger.warning("向量检索器未初始化，返回空结果")
                 return []
             
             # 生成查询向量
-            query_vector = embedding_manager.embed_text(query)
+            if query_vector is None:
+                query_vector = embedding_manager.embed_text(query)
             
             # 执行向量搜索
             results = qdrant_store.search_vectors(
@@ -87,22 +98,15 @@ class EmbeddingRetriever:
                 score_threshold=0.0
             )
             
-            # 补充metadata信息（支持多向量映射）
-            vector_ids = [result.metadata.get("vector_id") for result in results if result.metadata.get("vector_id")]
-            data_list = mongo_store.get_data_by_vector_ids(vector_ids)
-            
-            # 创建data_id到data的映射
+            # 补充metadata信息：向量payload里带有data_id，按id唯一索引批量取回数据，
+            # 不必再拉取vector_ids数组做反查
+            data_ids = list(dict.fromkeys(result.data_id for result in results if result.data_id))
+            data_list = mongo_store.get_data_by_ids(data_ids, fields=RETRIEVAL_FIELDS)
             data_map = {data.id: data for data in data_list}
             
             # 更新结果信息
             for result in results:
-                # 从向量找到对应的数据
-                matching_data = None
-                for data in data_list:
-                    if result.metadata.get("vector_id") in data.vector_ids:  # 检查向量ID是否在数据的vector_ids中
-                        matching_data = data
-                        break
-                
+                matching_data = data_map.get(result.data_id)
                 if matching_data:
                     result.data_id = matching_data.id
                     result.collection_id = matching_data.collection_id
@@ -124,6 +128,10 @@ class HybridRetriever:
     def __init__(self):
         self.embedding_retriever = EmbeddingRetriever()
         self.lexical_retriever = LexicalRetriever()
+        # 词法检索走MongoDB、向量检索走Qdrant，两路互不依赖，并发执行
+        self._lexical_executor = ThreadPoolExecutor(
+            max_workers=8, thread_name_prefix="lexical"
+        )
         self.initialized = False
         self.connected = False
     
@@ -149,7 +157,8 @@ class HybridRetriever:
         self, 
         query: Query,
         embedding_weight: float = 0.6,
-        lexical_weight: float = 0.4
+        lexical_weight: float = 0.4,
+        query_vector: Optional[List[float]] = None
     ) -> List[RetrievalResult]:
         """
         混合检索
@@ -158,6 +167,7 @@ class HybridRetriever:
             query: 查询对象
             embedding_weight: 向量检索权重
             lexical_weight: 词法检索权重
+            query_vector: 预先生成的查询向量（可选）
         
         Returns:
             合并后的检索结果
@@ -167,17 +177,20 @@ class HybridRetriever:
                 logger.warning("混合检索器未初始化")
                 return []
             
-            # 执行embedding检索
-            embedding_results = self.embedding_retriever.search(
-                query.optimized_question or query.question,
+            question = query.optimized_question or query.question
+
+            # 词法检索提交到线程池，与embedding检索同时进行
+            lexical_future = self._lexical_executor.submit(
+                self.lexical_retriever.search,
+                question,
                 top_k=query.top_k
             )
-            
-            # 执行词法检索
-            lexical_results = self.lexical_retriever.search(
-                query.optimized_question or query.question,
-                top_k=query.top_k
+            embedding_results = self.embedding_retriever.search(
+                question,
+                top_k=query.top_k,
+                query_vector=query_vector
             )
+            lexical_results = lexical_future.result()
 
             # 使用RRF合并结果
             merged_results = rrf_merger.merge_results(
@@ -3,6 +3,7 @@ import uuid
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
 
+from config.settings import app_config
 from app.models.data_models import ConversationTurn
 from app.stores.mongo import mongo_store
 
@@ -12,13 +13,19 @@ logger = logging.getLogger()
 class ConversationMemory:
     """对话历史记忆组件"""
 
-    def __init__(self, max_history_length: int = 10, session_timeout_hours: int = 24):
+    def __init__(
+        self, max_history_length: int = 10, session_timeout_hours: Optional[int] = None
+    ):
         self.max_history_length = max_history_length
-        self.session_timeout_hours = session_timeout_hours
+        self.session_timeout_hours = (
+            session_timeout_hours or app_config.conversation_timeout_hours
+        )
         self._local_cache: Dict[str, List[ConversationTurn]] = {}
 
         logger.info(
-            f"对话记忆组件初始化，最大历史长度: {max_history_length}, 会话超时: {session_timeout_hours}小时"
+            "对话记忆组件初始化，最大历史长度: %d, 会话超时: %d小时",
+            max_history_length,
+            self.session_timeout_hours,
         )
 
     def add_conversation_turn(
@@ -31,16 +38,22 @@ class ConversationMemory:
         relevance_score: float = 0.0,
         response_time: float = 0.0,
     ) -> str:
-        """添加对话轮次"""
+        """添加对话轮次，检索内容单独存入chunks_by_turn，对话只保存引用"""
         try:
             turn_id = str(uuid.uuid4())
 
+            chunk_refs = []
+            if retrieved_chunks:
+                chunk_refs = mongo_store.save_turn_chunks(turn_id, retrieved_chunks)
+                if not chunk_refs:
+                    logger.warning("保存检索内容到MongoDB失败: %s", turn_id)
+
             turn = ConversationTurn(
                 id=turn_id,
                 session_id=session_id,
                 question=question,
                 answer=answer,
-                retrieved_chunks=retrieved_chunks or [],
+                chunk_refs=chunk_refs,
                 timestamp=datetime.now(),
                 tokens_used=tokens_used,
                 relevance_score=relevance_score,
@@ -49,15 +62,15 @@ class ConversationMemory:
 
             success = mongo_store.save_conversation_turn(turn)
             if not success:
-                logger.warning(f"保存对话轮次到MongoDB失败: {turn_id}")
+                logger.warning("保存对话轮次到MongoDB失败: %s", turn_id)
 
             self._update_local_cache(session_id, turn)
 
-            logger.debug(f"添加对话轮次成功: {turn_id}")
+            logger.debug("添加对话轮次成功: %s", turn_id)
             return turn_id
 
         except Exception as e:
-            logger.error(f"添加对话轮次失败: {e}")
+            logger.error("添加对话轮次失败: %s", e)
             return ""
 
     def get_conversation_history(
@@ -90,11 +103,11 @@ class ConversationMemory:
 
             self._local_cache[session_id] = history
 
-            logger.debug(f"获取对话历史: session={session_id}, 数量={len(history)}")
+            logger.debug("获取对话历史: session=%s, 数量=%d", session_id, len(history))
             return history
 
         except Exception as e:
-            logger.error(f"获取对话历史失败: {e}")
+            logger.error("获取对话历史失败: %s", e)
             return []
 
     def get_recent_context(
@@ -122,13 +135,13 @@ class ConversationMemory:
 
             context = "\n\n".join(context_parts)
             logger.debug(
-                f"生成对话上下文: {len(context_parts)} 轮对话, ~{total_tokens} tokens"
+                "生成对话上下文: %d 轮对话, ~%d tokens", len(context_parts), total_tokens
             )
 
             return context
 
         except Exception as e:
-            logger.error(f"获取对话上下文失败: {e}")
+            logger.error("获取对话上下文失败: %s", e)
             return ""
 
     def clear_session_history(self, session_id: str) -> bool:
@@ -137,11 +150,11 @@ class ConversationMemory:
             if session_id in self._local_cache:
                 del self._local_cache[session_id]
 
-            logger.info(f"清除会话历史: {session_id}")
+            logger.info("清除会话历史: %s", session_id)
             return True
 
         except Exception as e:
-            logger.error(f"清除会话历史失败: {e}")
+            logger.error("清除会话历史失败: %s", e)
             return False
 
     def get_session_summary(self, session_id: str) -> Dict[str, Any]:
@@ -178,7 +191,7 @@ class ConversationMemory:
             return summary
 
         except Exception as e:
-            logger.error(f"获取会话摘要失败: {e}")
+            logger.error("获取会话摘要失败: %s", e)
             return {}
 
     def _update_local_cache(self, session_id: str, turn: ConversationTurn):
@@ -195,7 +208,7 @@ class ConversationMemory:
                 ]
 
         except Exception as e:
-            logger.error(f"更新本地缓存失败: {e}")
+            logger.error("更新本地缓存失败: %s", e)
 
     def _is_session_valid(self, timestamp: datetime) -> bool:
         """检查会话是否有效"""
@@ -205,7 +218,7 @@ class ConversationMemory:
             )
             return timestamp > timeout_threshold
         except Exception as e:
-            logger.error(f"检查会话有效性失败: {e}")
+            logger.error("检查会话有效性失败: %s", e)
             return True
 
     def cleanup_expired_sessions(self) -> int:
@@ -226,11 +239,11 @@ class ConversationMemory:
             for session_id in expired_sessions:
                 del self._local_cache[session_id]
 
-            logger.info(f"清理了 {len(expired_sessions)} 个过期会话")
+            logger.info("清理了 %d 个过期会话", len(expired_sessions))
             return len(expired_sessions)
 
         except Exception as e:
-            logger.error(f"清理过期会话失败: {e}")
+            logger.error("清理过期会话失败: %s", e)
             return 0
 
 
@@ -5,6 +5,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import time
 
 from app.models.data_models import Query, RetrievalResult
+from app.llms.embeddings import embedding_manager
 from app.rag.hybrid_retriever import hybrid_retriever
 from app.rag.rrf import rrf_merger
 
@@ -56,10 +57,15 @@ class ParallelRetriever:
                 )
                 query_objects.append(query_obj)
             
+            # 一次批量生成全部查询向量，避免每个线程各自调用嵌入接口
+            query_vectors = self._embed_queries(queries)
+            
             # 并行执行检索
             future_to_query = {}
             for i, query_obj in enumerate(query_objects):
-                future = self.executor.submit(self._single_retrieve, query_obj, i)
+                future = self.executor.submit(
+                    self._single_retrieve, query_obj, i, query_vectors[i]
+                )
                 future_to_query[future] = (query_obj, i)
             
             # 收集结果
@@ -100,7 +106,22 @@ class ParallelRetriever:
             logger.error(f"并行检索失败: {e}")
             return []
     
-    def _single_retrieve(self, query: Query, query_index: int) -> List[RetrievalResult]:
+    def _embed_queries(self, queries: List[str]) -> List[Optional[List[float]]]:
+        """批量生成查询向量，失败时返回None由各查询单独生成"""
+        try:
+            if embedding_manager.embeddings is None:
+                return [None] * len(queries)
+            return embedding_manager.embed_texts(queries)
+        except Exception as e:
+            logger.warning(f"批量生成查询向量失败，回退到逐条生成: {e}")
+            return [None] * len(queries)
+    
+    def _single_retrieve(
+        self,
+        query: Query,
+        query_index: int,
+        query_vector: Optional[List[float]] = None
+    ) -> List[RetrievalResult]:
         """单个查询的检索执行"""
         try:
             logger.debug(f"执行查询 {query_index}: {query.question}")
@@ -110,7 +131,7 @@ class ParallelRetriever:
                 hybrid_retriever.initialize()
             
             # 执行检索
-            results = hybrid_retriever.retrieve(query)
+            results = hybrid_retriever.retrieve(query, query_vector=query_vector)
             
             logger.debug(f"查询 {query_index} 检索完成，结果数: {len(results)}")
             return results
@@ -166,6 +187,8 @@ class ParallelRetriever:
             start_time = time.time()
             logger.info(f"开始异步并行检索，查询数量: {len(queries)}")
             
+            query_vectors = self._embed_queries(queries)
+            
             # 创建异步任务
             tasks = []
             for i, query_text in enumerate(queries):
@@ -177,7 +200,9 @@ class ParallelRetriever:
                     relevance_threshold=base_query.relevance_threshold,
                     top_k=base_query.top_k
                 )
-                task = asyncio.create_task(self._async_single_retrieve(query_obj, i))
+                task = asyncio.create_task(
+                    self._async_single_retrieve(query_obj, i, query_vectors[i])
+                )
                 tasks.append(task)
             
             # 等待所有任务完成
@@ -214,7 +239,12 @@ class ParallelRetriever:
             logger.error(f"异步并行检索失败: {e}")
             return []
     
-    async def _async_single_retrieve(self, query: Query, query_index: int) -> List[RetrievalResult]:
+    async def _async_single_retrieve(
+        self,
+        query: Query,
+        query_index: int,
+        query_vector: Optional[List[float]] = None
+    ) -> List[RetrievalResult]:
         """异步单个查询检索"""
         try:
             logger.debug(f"执行异步查询 {query_index}: {query.question}")
@@ -225,7 +255,8 @@ class ParallelRetriever:
                 self.executor, 
                 self._single_retrieve, 
                 query, 
-                query_index
+                query_index,
+                query_vector
             )
             
             return results
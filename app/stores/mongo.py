@@ -1,14 +1,73 @@
 import logging
-from typing import List, Optional, Dict, Any
-from pymongo import MongoClient
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from pydantic import BaseModel
+from pymongo import IndexModel, MongoClient, UpdateOne
 from pymongo.database import Database
 from pymongo.collection import Collection as PyMongoCollection
-from datetime import datetime
+from pymongo.errors import OperationFailure
+from datetime import datetime, timezone
 
 from config.settings import app_config
 from app.models.data_models import Dataset, Collection, Data, ConversationTurn
 
-logger = logging.getLogger()
+logger = logging.getLogger(__name__)
+
+# 大结果集读取时每次getMore拉取的文档数，默认首批只有101条
+CURSOR_BATCH_SIZE = 1000
+# 单次$in查询的最大取值个数，超出时分段查询
+IN_QUERY_CHUNK_SIZE = 500
+# 同名索引选项不同（如TTL过期时间变更）时create_index返回的错误码
+INDEX_OPTIONS_CONFLICT = 85
+
+
+class MongoClientPool:
+    """按 (uri, pid) 共享MongoClient
+
+    同一进程内的多个store复用一个连接池，而不是各自建池；
+    MongoClient不能跨fork使用，子进程按pid取到的是新建的客户端。
+    """
+
+    def __init__(self):
+        self._clients: Dict[Tuple[str, int], MongoClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, uri: str) -> MongoClient:
+        """获取当前进程的共享客户端，不存在时创建"""
+        key = (uri, os.getpid())
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                # 导入路径写多读少：压缩大段content的传输，单节点确认即可
+                client = MongoClient(
+                    uri,
+                    maxPoolSize=app_config.mongodb_max_pool_size,
+                    minPoolSize=app_config.mongodb_min_pool_size,
+                    compressors=app_config.mongodb_compressors,
+                    retryWrites=True,
+                    w=1,
+                    serverSelectionTimeoutMS=5000,
+                )
+                self._clients[key] = client
+            return client
+
+    def close(self, uri: str) -> None:
+        """关闭当前进程的共享客户端"""
+        with self._lock:
+            client = self._clients.pop((uri, os.getpid()), None)
+        if client:
+            client.close()
+
+
+mongo_client_pool = MongoClientPool()
+
+
+def _projection(fields: Optional[List[str]] = None) -> Dict[str, int]:
+    """只取指定字段；fields为空时取除_id外的全部字段。fields需包含模型的必填字段"""
+    if not fields:
+        return {"_id": 0}
+    return {"_id": 0, **{field: 1 for field in fields}}
 
 
 class MongoMetadataStore:
@@ -22,7 +81,7 @@ class MongoMetadataStore:
     def connect(self):
         """连接MongoDB"""
         try:
-            self.client = MongoClient(app_config.mongodb_uri)
+            self.client = mongo_client_pool.get(app_config.mongodb_uri)
             self.db = self.client.get_default_database()
 
             self._collections = {
@@ -30,6 +89,7 @@ class MongoMetadataStore:
                 "collections": self.db.collections,
                 "data": self.db.data,
                 "conversations": self.db.conversations,
+                "chunks_by_turn": self.db.chunks_by_turn,
             }
 
             self._create_indexes()
@@ -37,36 +97,88 @@ class MongoMetadataStore:
             logger.info("MongoDB连接成功，支持三层架构")
 
         except Exception as e:
-            logger.error(f"MongoDB连接失败: {e}")
+            logger.error("MongoDB连接失败: %s", e)
             raise
 
     def _create_indexes(self):
-        """创建必要的索引"""
+        """创建必要的索引，每个集合一次create_indexes"""
+        index_specs = {
+            "datasets": [
+                IndexModel("id", unique=True),
+                IndexModel("name"),
+            ],
+            "collections": [
+                IndexModel("id", unique=True),
+                # 前缀同时覆盖按dataset_id查询
+                IndexModel([("dataset_id", 1), ("name", 1)]),
+                IndexModel("name"),
+            ],
+            "data": [
+                IndexModel("id", unique=True),
+                IndexModel("collection_id"),
+                IndexModel("vector_ids"),
+                IndexModel([("content", "text")]),
+                # 只索引未处理的数据：已处理的行不占索引空间，待处理计数和查询只扫索引
+                IndexModel(
+                    [("metadata.processed", 1), ("collection_id", 1)],
+                    partialFilterExpression={"metadata.processed": False},
+                ),
+            ],
+            "conversations": [
+                # get_conversation_history 依赖该复合索引走 IXSCAN 并免去内存排序，不要删除
+                IndexModel([("session_id", 1), ("timestamp", -1)]),
+                IndexModel("timestamp"),
+            ],
+            "chunks_by_turn": [
+                IndexModel("id", unique=True),
+                IndexModel([("turn_id", 1), ("index", 1)], unique=True),
+            ],
+        }
+
+        # 单个集合的索引冲突不影响其他集合
+        failed = []
+        for name, indexes in index_specs.items():
+            try:
+                self._collections[name].create_indexes(indexes)
+            except Exception as e:
+                failed.append(name)
+                logger.warning("创建索引时出现警告: %s, %s", name, e)
+
+        # 检索内容只服务于会话期，过期后由TTL索引自动清理。TTL索引单独创建，
+        # 过期时间变更引起的冲突不会连带同集合的唯一索引一起失败
         try:
-            self._collections["datasets"].create_index("id", unique=True)
-            self._collections["datasets"].create_index("name")
-
-            self._collections["collections"].create_index("id", unique=True)
-            self._collections["collections"].create_index("dataset_id")
-            self._collections["collections"].create_index("name")
-
-            self._collections["data"].create_index("id", unique=True)
-            self._collections["data"].create_index("collection_id")
-            self._collections["data"].create_index("vector_ids")
-            self._collections["data"].create_index([("content", "text")])
-
-            self._collections["conversations"].create_index("session_id")
-            self._collections["conversations"].create_index("timestamp")
+            self._ensure_ttl_index(
+                "chunks_by_turn",
+                "created_at",
+                app_config.conversation_timeout_hours * 3600,
+            )
+        except Exception as e:
+            failed.append("chunks_by_turn")
+            logger.warning("创建TTL索引时出现警告: %s", e)
 
+        if not failed:
             logger.info("MongoDB索引创建完成")
 
-        except Exception as e:
-            logger.warning(f"创建索引时出现警告: {e}")
+    def _ensure_ttl_index(self, name: str, field: str, expire_seconds: int) -> None:
+        """创建TTL索引；已存在但过期时间不同时用collMod原地修改，不删除重建"""
+        collection = self._collections[name]
+        try:
+            collection.create_index(field, expireAfterSeconds=expire_seconds)
+        except OperationFailure as e:
+            if e.code != INDEX_OPTIONS_CONFLICT:
+                raise
+            collection.database.command(
+                "collMod",
+                name,
+                index={"keyPattern": {field: 1}, "expireAfterSeconds": expire_seconds},
+            )
+            logger.info("更新TTL索引过期时间: %s.%s -> %ds", name, field, expire_seconds)
 
     def close(self):
-        """关闭连接"""
+        """关闭连接，共享同一客户端的其他store也随之断开"""
         if self.client:
-            self.client.close()
+            mongo_client_pool.close(app_config.mongodb_uri)
+            self.client = None
             logger.info("MongoDB连接已关闭")
 
     # 数据集操作
@@ -75,40 +187,46 @@ class MongoMetadataStore:
         """创建数据集"""
         try:
             result = self._collections["datasets"].insert_one(dataset.model_dump())
-            logger.info(f"创建数据集: {dataset.name} (ID: {dataset.id})")
+            logger.info("创建数据集: %s (ID: %s)", dataset.name, dataset.id)
             return result.acknowledged
 
         except Exception as e:
-            logger.error(f"创建数据集失败: {e}")
+            logger.error("创建数据集失败: %s", e)
             return False
 
     def get_dataset(self, dataset_id: str) -> Optional[Dataset]:
         """获取数据集"""
         try:
-            doc = self._collections["datasets"].find_one({"id": dataset_id})
+            doc = self._collections["datasets"].find_one({"id": dataset_id}, {"_id": 0})
             if doc:
-                doc.pop("_id", None)
                 return Dataset(**doc)
             return None
 
         except Exception as e:
-            logger.error(f"获取数据集失败: {e}")
+            logger.error("获取数据集失败: %s", e)
             return None
 
-    def update_dataset_stats(self, dataset_id: str, data_count: int, total_tokens: int):
-        """更新数据集统计信息"""
+    def update_dataset_stats(
+        self,
+        dataset_id: str,
+        data_count: int,
+        total_tokens: int,
+        *,
+        now: Optional[datetime] = None,
+    ):
+        """更新数据集统计信息，now由调用方传入时多处更新共用同一时间戳"""
         try:
             self._collections["datasets"].update_one(
                 {"id": dataset_id},
                 {
                     "$inc": {"data_count": data_count, "total_tokens": total_tokens},
-                    "$set": {"updated_at": datetime.now()},
+                    "$set": {"updated_at": now or datetime.now()},
                 },
             )
-            logger.debug(f"更新数据集统计: {dataset_id}")
+            logger.debug("更新数据集统计: %s", dataset_id)
 
         except Exception as e:
-            logger.error(f"更新数据集统计失败: {e}")
+            logger.error("更新数据集统计失败: %s", e)
 
     # 集合操作
 
@@ -118,88 +236,152 @@ class MongoMetadataStore:
             result = self._collections["collections"].insert_one(
                 collection.model_dump()
             )
-            logger.info(f"创建集合: {collection.name} (ID: {collection.id})")
+            logger.info("创建集合: %s (ID: %s)", collection.name, collection.id)
             return result.acknowledged
 
         except Exception as e:
-            logger.error(f"创建集合失败: {e}")
+            logger.error("创建集合失败: %s", e)
             return False
 
     def get_collection(self, collection_id: str) -> Optional[Collection]:
         """获取集合"""
         try:
-            doc = self._collections["collections"].find_one({"id": collection_id})
+            doc = self._collections["collections"].find_one({"id": collection_id}, {"_id": 0})
             if doc:
-                doc.pop("_id", None)
                 return Collection(**doc)
             return None
 
         except Exception as e:
-            logger.error(f"获取集合失败: {e}")
+            logger.error("获取集合失败: %s", e)
             return None
 
     def update_collection_stats(
-        self, collection_id: str, data_count: int, total_tokens: int
+        self,
+        collection_id: str,
+        data_count: int,
+        total_tokens: int,
+        *,
+        now: Optional[datetime] = None,
     ):
-        """更新集合统计信息"""
+        """更新集合统计信息，now由调用方传入时多处更新共用同一时间戳"""
         try:
             self._collections["collections"].update_one(
                 {"id": collection_id},
                 {
                     "$inc": {"data_count": data_count, "total_tokens": total_tokens},
-                    "$set": {"updated_at": datetime.now()},
+                    "$set": {"updated_at": now or datetime.now()},
                 },
             )
-            logger.debug(f"更新集合统计: {collection_id}")
+            logger.debug("更新集合统计: %s", collection_id)
 
         except Exception as e:
-            logger.error(f"更新集合统计失败: {e}")
+            logger.error("更新集合统计失败: %s", e)
 
     # 数据操作（支持多向量映射）
 
     def create_data(self, data: Data) -> bool:
         """创建数据条目（支持多向量映射）"""
         try:
-            result = self._collections["data"].insert_one(data.model_dump())
-            logger.debug(f"创建数据: {data.id}, 向量数: {len(data.vector_ids)}")
+            result = self._collections["data"].insert_one(data.to_bson_dict())
+            logger.debug("创建数据: %s, 向量数: %d", data.id, len(data.vector_ids))
             return result.acknowledged
 
         except Exception as e:
-            logger.error(f"创建数据失败: {e}")
+            logger.error("创建数据失败: %s", e)
             return False
 
+    def bulk_create_data(
+        self, data_list: List[Data], ordered: bool = False, chunk: int = 500
+    ) -> bool:
+        """批量创建数据条目，按chunk分批insert_many"""
+        if not data_list:
+            return True
+
+        try:
+            docs = [data.to_bson_dict() for data in data_list]
+            self._insert_many_chunked("data", docs, ordered, chunk)
+            logger.debug("批量创建数据: %d 条", len(data_list))
+            return True
+
+        except Exception as e:
+            logger.error("批量创建数据失败: %s", e)
+            return False
+
+    def _insert_many_chunked(
+        self, name: str, docs: List[Dict[str, Any]], ordered: bool, chunk: int
+    ) -> None:
+        """按chunk分批insert_many，ordered=False时单条重复键不会中断整批"""
+        for start in range(0, len(docs), chunk):
+            self._collections[name].insert_many(
+                docs[start : start + chunk], ordered=ordered
+            )
+
     def get_data(self, data_id: str) -> Optional[Data]:
         """获取数据条目"""
         try:
-            doc = self._collections["data"].find_one({"id": data_id})
+            doc = self._collections["data"].find_one({"id": data_id}, {"_id": 0})
             if doc:
-                doc.pop("_id", None)
                 return Data(**doc)
             return None
 
         except Exception as e:
-            logger.error(f"获取数据失败: {e}")
+            logger.error("获取数据失败: %s", e)
             return None
 
-    def get_data_by_vector_ids(self, vector_ids: List[str]) -> List[Data]:
-        """根据向量ID列表获取数据（多向量映射核心功能）"""
+    def get_data_by_ids(
+        self, data_ids: List[str], fields: Optional[List[str]] = None
+    ) -> List[Data]:
+        """根据数据ID列表批量获取数据，走id唯一索引"""
         try:
-            docs = self._collections["data"].find({"vector_ids": {"$in": vector_ids}})
+            return self._find_data_in("id", data_ids, fields)
 
-            data_list = []
-            for doc in docs:
-                doc.pop("_id", None)
-                data_list.append(Data(**doc))
+        except Exception as e:
+            logger.error("根据ID批量获取数据失败: %s", e)
+            return []
 
-            logger.debug(f"根据{len(vector_ids)}个向量ID找到{len(data_list)}个数据条目")
+    def get_data_by_vector_ids(
+        self, vector_ids: List[str], fields: Optional[List[str]] = None
+    ) -> List[Data]:
+        """根据向量ID列表获取数据（多向量映射核心功能）"""
+        try:
+            data_list = self._find_data_in("vector_ids", vector_ids, fields)
+
+            logger.debug("根据%d个向量ID找到%d个数据条目", len(vector_ids), len(data_list))
             return data_list
 
         except Exception as e:
-            logger.error(f"根据向量ID获取数据失败: {e}")
+            logger.error("根据向量ID获取数据失败: %s", e)
             return []
 
+    def _find_data_in(
+        self, field: str, values: List[str], fields: Optional[List[str]]
+    ) -> List[Data]:
+        """把大$in拆成每IN_QUERY_CHUNK_SIZE个一次查询，结果按数据ID去重"""
+        values = list(dict.fromkeys(values))
+        data_by_id: Dict[str, Data] = {}
+
+        for start in range(0, len(values), IN_QUERY_CHUNK_SIZE):
+            docs = (
+                self._collections["data"]
+                .find(
+                    {field: {"$in": values[start : start + IN_QUERY_CHUNK_SIZE]}},
+                    _projection(fields),
+                )
+                .batch_size(CURSOR_BATCH_SIZE)
+            )
+            for doc in docs:
+                # 一条数据有多个向量，可能在不同分段里重复命中
+                if doc["id"] not in data_by_id:
+                    data_by_id[doc["id"]] = Data(**doc)
+
+        return list(data_by_id.values())
+
     def search_data_by_content(
-        self, query: str, collection_id: Optional[str] = None, limit: int = 20
+        self,
+        query: str,
+        collection_id: Optional[str] = None,
+        limit: int = 20,
+        fields: Optional[List[str]] = None,
     ) -> List[Data]:
         """基于MongoDB全文索引的词法检索。"""
         try:
@@ -210,24 +392,26 @@ class MongoMetadataStore:
 
             docs = (
                 self._collections["data"]
-                .find(search_condition, {"score": {"$meta": "textScore"}})
+                .find(
+                    search_condition,
+                    {**_projection(fields), "score": {"$meta": "textScore"}},
+                )
                 .sort([("score", {"$meta": "textScore"})])
                 .limit(limit)
             )
 
             data_list = []
             for doc in docs:
-                doc.pop("_id", None)
                 text_score = doc.pop("score", 0.0)
                 data = Data(**doc)
                 data.metadata["text_score"] = text_score
                 data_list.append(data)
 
-            logger.debug(f"全文检索找到{len(data_list)}个结果")
+            logger.debug("全文检索找到%d个结果", len(data_list))
             return data_list
 
         except Exception as e:
-            logger.error(f"全文检索失败: {e}")
+            logger.error("全文检索失败: %s", e)
             return []
 
     # 对话历史操作
@@ -239,30 +423,73 @@ class MongoMetadataStore:
             return result.acknowledged
 
         except Exception as e:
-            logger.error(f"保存对话轮次失败: {e}")
+            logger.error("保存对话轮次失败: %s", e)
             return False
 
+    def save_turn_chunks(self, turn_id: str, chunks: List[BaseModel]) -> List[str]:
+        """批量保存对话轮次的检索内容，返回供对话文档引用的ID列表"""
+        if not chunks:
+            return []
+
+        try:
+            created_at = datetime.now(timezone.utc)
+            docs = [
+                {
+                    "id": f"{turn_id}:{index}",
+                    "turn_id": turn_id,
+                    "index": index,
+                    "created_at": created_at,
+                    "chunk": chunk.model_dump(),
+                }
+                for index, chunk in enumerate(chunks)
+            ]
+            self._collections["chunks_by_turn"].insert_many(docs, ordered=False)
+            return [doc["id"] for doc in docs]
+
+        except Exception as e:
+            logger.error("保存检索内容失败: %s", e)
+            return []
+
+    def _attach_turn_chunks(self, history: List[ConversationTurn]) -> None:
+        """一次$in查询加载对话轮次引用的检索内容"""
+        refs = [ref for turn in history for ref in turn.chunk_refs]
+        if not refs:
+            return
+
+        docs = (
+            self._collections["chunks_by_turn"]
+            .find({"id": {"$in": refs}}, {"_id": 0, "turn_id": 1, "chunk": 1})
+            .sort("index", 1)
+        )
+
+        chunks_by_turn: Dict[str, List[Dict[str, Any]]] = {}
+        for doc in docs:
+            chunks_by_turn.setdefault(doc["turn_id"], []).append(doc["chunk"])
+
+        for turn in history:
+            turn.retrieved_chunks = chunks_by_turn.get(turn.id, [])
+
     def get_conversation_history(
-        self, session_id: str, limit: int = 10
+        self, session_id: str, limit: int = 10, with_chunks: bool = False
     ) -> List[ConversationTurn]:
-        """获取对话历史"""
+        """获取对话历史，with_chunks为True时从chunks_by_turn加载检索内容"""
         try:
+            # 旧版本把检索内容内嵌在对话文档里，读取时一律排除
             docs = (
                 self._collections["conversations"]
-                .find({"session_id": session_id})
+                .find({"session_id": session_id}, {"_id": 0, "retrieved_chunks": 0})
                 .sort("timestamp", -1)
                 .limit(limit)
             )
+            history = [ConversationTurn(**doc) for doc in docs]
 
-            history = []
-            for doc in docs:
-                doc.pop("_id", None)
-                history.append(ConversationTurn(**doc))
+            if with_chunks:
+                self._attach_turn_chunks(history)
 
             return list(reversed(history))
 
         except Exception as e:
-            logger.error(f"获取对话历史失败: {e}")
+            logger.error("获取对话历史失败: %s", e)
             return []
 
     # 导入服务支持方法
@@ -270,80 +497,119 @@ class MongoMetadataStore:
     def get_dataset_by_name(self, name: str) -> Optional[Dataset]:
         """根据名称获取数据集"""
         try:
-            doc = self._collections["datasets"].find_one({"name": name})
+            doc = self._collections["datasets"].find_one({"name": name}, {"_id": 0})
             if doc:
-                doc.pop("_id", None)
                 return Dataset(**doc)
             return None
         except Exception as e:
-            logger.error(f"根据名称获取数据集失败: {e}")
+            logger.error("根据名称获取数据集失败: %s", e)
             return None
 
     def get_all_collections(self) -> List[Collection]:
         """获取所有集合（知识库文件列表）"""
         try:
-            docs = self._collections["collections"].find().sort("created_at", -1)
-            collections = []
-            for doc in docs:
-                doc.pop("_id", None)
-                collections.append(Collection(**doc))
-            return collections
+            docs = (
+                self._collections["collections"]
+                .find({}, {"_id": 0})
+                .sort("created_at", -1)
+            )
+            return [Collection(**doc) for doc in docs]
         except Exception as e:
-            logger.error(f"获取所有集合失败: {e}")
+            logger.error("获取所有集合失败: %s", e)
             return []
 
+    def get_collection_by_name(
+        self, dataset_id: str, name: str
+    ) -> Optional[Collection]:
+        """按数据集和名称获取集合"""
+        try:
+            doc = self._collections["collections"].find_one(
+                {"dataset_id": dataset_id, "name": name}, {"_id": 0}
+            )
+            if doc:
+                return Collection(**doc)
+            return None
+        except Exception as e:
+            logger.error("根据名称获取集合失败: %s", e)
+            return None
+
     def get_collections_by_dataset(self, dataset_id: str) -> List[Collection]:
         """获取数据集下的所有集合"""
         try:
-            docs = self._collections["collections"].find({"dataset_id": dataset_id})
-            collections = []
-            for doc in docs:
-                doc.pop("_id", None)
-                collections.append(Collection(**doc))
-            return collections
+            docs = self._collections["collections"].find(
+                {"dataset_id": dataset_id}, {"_id": 0}
+            )
+            return [Collection(**doc) for doc in docs]
         except Exception as e:
-            logger.error(f"获取数据集集合失败: {e}")
+            logger.error("获取数据集集合失败: %s", e)
             return []
 
-    def get_data_by_collection(self, collection_id: str) -> List[Data]:
+    def get_data_by_collection(
+        self, collection_id: str, fields: Optional[List[str]] = None
+    ) -> List[Data]:
         """获取集合下的所有数据"""
         try:
-            docs = self._collections["data"].find({"collection_id": collection_id})
-            data_list = []
-            for doc in docs:
-                doc.pop("_id", None)
-                data_list.append(Data(**doc))
-            return data_list
+            docs = (
+                self._collections["data"]
+                .find({"collection_id": collection_id}, _projection(fields))
+                .batch_size(CURSOR_BATCH_SIZE)
+            )
+            return [Data(**doc) for doc in docs]
         except Exception as e:
-            logger.error(f"获取集合数据失败: {e}")
+            logger.error("获取集合数据失败: %s", e)
             return []
 
+    def iter_data_by_collection(self, collection_id: str) -> Iterator[Data]:
+        """逐条产出集合下的数据，不在内存中构建完整列表"""
+        return self._iter_data({"collection_id": collection_id})
+
+    def get_pending_data_batch(self, limit: int) -> List[Data]:
+        """取一段未处理数据，每段单独查询，不跨嵌入调用占着游标。
+        查询失败直接抛出，不当作没有待处理数据"""
+        docs = (
+            self._collections["data"]
+            .find({"metadata.processed": False}, {"_id": 0})
+            .limit(limit)
+        )
+        return [Data(**doc) for doc in docs]
+
+    def _iter_data(self, condition: Dict[str, Any]) -> Iterator[Data]:
+        """游标中途出错（如CursorNotFound）直接抛给调用方，不能静默截断"""
+        docs = (
+            self._collections["data"]
+            .find(condition, {"_id": 0})
+            .batch_size(CURSOR_BATCH_SIZE)
+        )
+        for doc in docs:
+            yield Data(**doc)
+
     def get_pending_data_by_collection(self, collection_id: str) -> List[Data]:
         """获取集合下未处理的数据"""
         try:
-            docs = self._collections["data"].find(
-                {"collection_id": collection_id, "metadata.processed": False}
+            docs = (
+                self._collections["data"]
+                .find(
+                    {"collection_id": collection_id, "metadata.processed": False},
+                    {"_id": 0},
+                )
+                .batch_size(CURSOR_BATCH_SIZE)
             )
-            data_list = []
-            for doc in docs:
-                doc.pop("_id", None)
-                data_list.append(Data(**doc))
-            return data_list
+            return [Data(**doc) for doc in docs]
         except Exception as e:
-            logger.error(f"获取未处理数据失败: {e}")
+            logger.error("获取未处理数据失败: %s", e)
             return []
 
     def get_all_pending_data(self) -> List[Data]:
         """获取系统中所有未处理的数据"""
         try:
-            docs = self._collections["data"].find({"metadata.processed": False})
-            data_list = []
-            for doc in docs:
-                doc.pop("_id", None)
-                data_list.append(Data(**doc))
-            return data_list
+            docs = (
+                self._collections["data"]
+                .find({"metadata.processed": False}, {"_id": 0})
+                .batch_size(CURSOR_BATCH_SIZE)
+            )
+            return [Data(**doc) for doc in docs]
         except Exception as e:
-            logger.error(f"获取所有未处理数据失败: {e}")
+            logger.error("获取所有未处理数据失败: %s", e)
             return []
 
     def get_pending_data_count(self) -> int:
@@ -354,18 +620,45 @@ class MongoMetadataStore:
             )
             return count
         except Exception as e:
-            logger.error(f"获取未处理数据计数失败: {e}")
+            logger.error("获取未处理数据计数失败: %s", e)
             return 0
 
     def update_data(self, data_id: str, data: Data) -> bool:
         """更新数据"""
         try:
             result = self._collections["data"].replace_one(
-                {"id": data_id}, data.model_dump()
+                {"id": data_id}, data.to_bson_dict()
             )
             return result.modified_count > 0
         except Exception as e:
-            logger.error(f"更新数据失败: {e}")
+            logger.error("更新数据失败: %s", e)
+            return False
+
+    def mark_processed(self, vector_map: Dict[str, List[str]]) -> bool:
+        """标记数据已向量化，只写 vector_ids、processed 和 vector_count 三个字段"""
+        if not vector_map:
+            return True
+
+        try:
+            now = datetime.now()
+            operations = [
+                UpdateOne(
+                    {"id": data_id},
+                    {
+                        "$set": {
+                            "vector_ids": vector_ids,
+                            "metadata.processed": True,
+                            "metadata.vector_count": len(vector_ids),
+                            "updated_at": now,
+                        }
+                    },
+                )
+                for data_id, vector_ids in vector_map.items()
+            ]
+            result = self._collections["data"].bulk_write(operations, ordered=False)
+            return result.acknowledged
+        except Exception as e:
+            logger.error("标记数据已处理失败: %s", e)
             return False
 
 
@@ -1,6 +1,9 @@
 import logging
-from typing import List, Optional
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
 
+import numpy as np
 from qdrant_client import QdrantClient, models
 
 from app.models.data_models import EmbeddingVector, RetrievalResult
@@ -8,6 +11,9 @@ from config.settings import app_config
 
 logger = logging.getLogger()
 
+# 集合未显式配置 indexing_threshold 时（返回null）恢复到的值，与Qdrant服务端默认值一致
+DEFAULT_INDEXING_THRESHOLD = 10000
+
 
 class QdrantVectorStore:
     """Qdrant向量数据库存储管理器"""
@@ -17,6 +23,10 @@ class QdrantVectorStore:
         self.collection_name = app_config.qdrant_collection
         self.dimension: Optional[int] = None
         self.connected = False
+        # 批量导入可能嵌套或并发，只有最外层进入时关索引、最外层退出时恢复
+        self._bulk_import_lock = threading.Lock()
+        self._bulk_import_depth = 0
+        self._restore_threshold: Optional[int] = None
 
     def connect(self, dimension: int = 1536):
         """连接Qdrant数据库"""
@@ -42,17 +52,79 @@ class QdrantVectorStore:
             logger.info(f"加载现有集合: {self.collection_name}")
             return
         except Exception:
+            # 向量按FP16存储，存储和内存占用减半，COSINE召回几乎无损
+            quantization_config = None
+            if app_config.qdrant_int8_quantization:
+                quantization_config = models.ScalarQuantization(
+                    scalar=models.ScalarQuantizationConfig(
+                        type=models.ScalarType.INT8,
+                        always_ram=True,
+                    )
+                )
+
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=models.VectorParams(
                     size=self.dimension,
                     distance=models.Distance.COSINE,
+                    datatype=models.Datatype.FLOAT16,
                 ),
+                quantization_config=quantization_config,
             )
             logger.info(f"创建新集合: {self.collection_name}")
 
-    def insert_vectors(self, vectors: List[EmbeddingVector]) -> bool:
-        """批量插入向量"""
+    @contextmanager
+    def bulk_import_mode(self) -> Iterator[None]:
+        """批量导入期间暂停HNSW索引构建，退出时恢复，由优化器在全量数据上一次性建索引"""
+        with self._bulk_import_lock:
+            self._bulk_import_depth += 1
+            if self._bulk_import_depth == 1:
+                self._restore_threshold = self._pause_indexing()
+        try:
+            yield
+        finally:
+            with self._bulk_import_lock:
+                self._bulk_import_depth -= 1
+                if self._bulk_import_depth == 0 and self._restore_threshold is not None:
+                    self._resume_indexing(self._restore_threshold)
+                    self._restore_threshold = None
+
+    def _pause_indexing(self) -> Optional[int]:
+        """关闭索引构建，返回退出时要恢复的阈值；关闭失败返回None，退出时不做恢复"""
+        try:
+            previous_threshold = self._set_indexing_threshold(0)
+        except Exception as e:
+            logger.error(f"暂停Qdrant索引构建失败: {e}")
+            return None
+
+        # 原阈值为0多半是上次导入被强杀、没来得及恢复，按默认值恢复，避免索引永久关闭
+        if not previous_threshold:
+            return DEFAULT_INDEXING_THRESHOLD
+        return previous_threshold
+
+    def _resume_indexing(self, threshold: int) -> None:
+        """恢复索引阈值"""
+        try:
+            self._set_indexing_threshold(threshold)
+        except Exception as e:
+            logger.error(f"恢复Qdrant索引阈值失败: {e}")
+
+    def _set_indexing_threshold(self, threshold: int) -> Optional[int]:
+        """设置集合的索引阈值，返回原阈值（集合未显式配置时为None），失败时抛异常"""
+        if not self.client:
+            raise RuntimeError("Qdrant客户端未初始化")
+
+        info = self.client.get_collection(self.collection_name)
+        previous_threshold = info.config.optimizer_config.indexing_threshold
+        self.client.update_collection(
+            collection_name=self.collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=threshold),
+        )
+        logger.info(f"Qdrant索引阈值: {previous_threshold} -> {threshold}")
+        return previous_threshold
+
+    def insert_vectors(self, vectors: List[EmbeddingVector], wait: bool = True) -> bool:
+        """批量插入向量，wait为False时不等待写入生效，适合批量导入的中间批次"""
         try:
             if not self.client:
                 raise RuntimeError("Qdrant客户端未初始化")
@@ -72,10 +144,42 @@ class QdrantVectorStore:
             self.client.upsert(
                 collection_name=self.collection_name,
                 points=points,
-                wait=True,
+                wait=wait,
+            )
+
+            logger.debug("成功插入 %d 个向量", len(vectors))
+            return True
+
+        except Exception as e:
+            logger.error(f"插入向量失败: {e}")
+            return False
+
+    def insert_vector_batch(
+        self,
+        ids: List[str],
+        data_ids: List[str],
+        vectors: np.ndarray,
+        model: str,
+        wait: bool = True,
+    ) -> bool:
+        """按列批量插入向量，vectors为 (N, dim) 矩阵，与ids、data_ids按行对应"""
+        try:
+            if not self.client:
+                raise RuntimeError("Qdrant客户端未初始化")
+
+            self.client.upsert(
+                collection_name=self.collection_name,
+                points=models.Batch(
+                    ids=ids,
+                    vectors=vectors.tolist(),
+                    payloads=[
+                        {"data_id": data_id, "model": model} for data_id in data_ids
+                    ],
+                ),
+                wait=wait,
             )
 
-            logger.info(f"成功插入 {len(vectors)} 个向量")
+            logger.debug("成功插入 %d 个向量", len(ids))
             return True
 
         except Exception as e:
@@ -115,7 +219,7 @@ class QdrantVectorStore:
                 )
                 results.append(result)
 
-            logger.debug(f"向量搜索返回 {len(results)} 个结果")
+            logger.debug("向量搜索返回 %d 个结果", len(results))
             return results
 
         except Exception as e:
@@ -26,7 +26,7 @@ async def clear_all_data():
         # 确认操作
         print("⚠️  警告：此操作将清空所有数据！")
         print("📊 包括：")
-        print("   - MongoDB中的所有datasets、collections、data")
+        print("   - MongoDB中的所有datasets、collections、data、对话记录")
         print("   - Qdrant向量库中的所有向量")
         print("")
         
@@ -37,15 +37,15 @@ async def clear_all_data():
         
         print("\n🗑️  开始清空数据...")
         
-        # 1. 清空MongoDB
-        logger.info("1️⃣ 清空MongoDB数据...")
-        success_mongo = await clear_mongodb()
+        # MongoDB和Qdrant互不依赖，两者都是同步驱动，放到线程里并行清空
+        logger.info("🧹 并行清空MongoDB数据和Qdrant向量库...")
+        results = await asyncio.gather(
+            asyncio.to_thread(clear_mongodb),
+            asyncio.to_thread(clear_qdrant),
+            return_exceptions=True,
+        )
         
-        # 2. 清空Qdrant
-        logger.info("2️⃣ 清空Qdrant向量库...")
-        success_qdrant = await clear_qdrant()
-        
-        if success_mongo and success_qdrant:
+        if all(result is True for result in results):
             print("\n🎉 所有数据清空完成！")
             print("💡 现在可以重新导入数据了")
             return True
@@ -59,7 +59,7 @@ async def clear_all_data():
         traceback.print_exc()
         return False
 
-async def clear_mongodb():
+def clear_mongodb():
     """清空MongoDB数据"""
     try:
         from app.stores.mongo import mongo_store
@@ -68,34 +68,33 @@ async def clear_mongodb():
         mongo_store.connect()
         
         # 获取所有集合
-        collections = ['datasets', 'collections', 'data', 'conversations']
+        collections = ['datasets', 'collections', 'data', 'conversations', 'chunks_by_turn']
         
         total_deleted = 0
         for collection_name in collections:
             if collection_name in mongo_store._collections:
                 collection = mongo_store._collections[collection_name]
                 
-                # 统计数据
-                count_before = collection.count_documents({})
-                logger.info(f"📋 {collection_name}: {count_before} 条记录")
+                # 计数读集合元数据、不扫描文档，可能不准，只用于日志
+                count_before = collection.estimated_document_count()
+                logger.info(f"📋 {collection_name}: 约 {count_before} 条记录")
                 
-                if count_before > 0:
-                    # 清空集合
-                    result = collection.delete_many({})
-                    deleted_count = result.deleted_count
-                    total_deleted += deleted_count
-                    logger.info(f"🗑️  {collection_name}: 删除了 {deleted_count} 条记录")
-                else:
-                    logger.info(f"✅ {collection_name}: 已经为空")
+                # 无论计数多少都直接删除整个集合：看似为空的集合也可能残留数据或旧索引
+                collection.drop()
+                total_deleted += count_before
+                logger.info(f"🗑️  {collection_name}: 已删除集合")
+        
+        # drop会连同索引一起删除，重新创建
+        mongo_store._create_indexes()
         
-        logger.info(f"✅ MongoDB清空完成，总共删除 {total_deleted} 条记录")
+        logger.info(f"✅ MongoDB清空完成，总共删除约 {total_deleted} 条记录")
         return True
         
     except Exception as e:
         logger.error(f"❌ MongoDB清空失败: {e}")
         return False
 
-async def clear_qdrant():
+def clear_qdrant():
     """清空Qdrant向量库"""
     try:
         from app.stores.qdrant import qdrant_store
@@ -86,6 +86,12 @@ class AppSettings(BaseSettings):
     app_env: str = Field(default="dev", env="APP_ENV", description="应用环境标识")
     app_port: int = Field(default=8000, env="APP_PORT", description="应用服务端口")
     debug: bool = Field(default=True, env="DEBUG", description="调试模式开关")
+    app_workers: int = Field(
+        default=1,
+        env="APP_WORKERS",
+        description="uvicorn worker数量。导入任务、对话缓存和启动时的待处理数据补嵌入都在进程内，"
+        "这些状态共享之前保持1",
+    )
     log_level: str = Field(
         default="INFO",
         env="LOG_LEVEL",
@@ -106,6 +112,11 @@ class AppSettings(BaseSettings):
         env="QDRANT_COLLECTION",
         description="Qdrant集合名称",
     )
+    qdrant_int8_quantization: bool = Field(
+        default=False,
+        env="QDRANT_INT8_QUANTIZATION",
+        description="新建集合时是否额外启用int8标量量化",
+    )
 
     # MongoDB配置
     mongodb_uri: str = Field(
@@ -113,6 +124,17 @@ class AppSettings(BaseSettings):
         env="MONGODB_URI",
         description="MongoDB连接字符串",
     )
+    mongodb_max_pool_size: int = Field(
+        default=32, env="MONGODB_MAX_POOL_SIZE", description="MongoDB连接池最大连接数"
+    )
+    mongodb_min_pool_size: int = Field(
+        default=4, env="MONGODB_MIN_POOL_SIZE", description="MongoDB连接池保持的最少连接数"
+    )
+    mongodb_compressors: str = Field(
+        default="zstd,zlib",
+        env="MONGODB_COMPRESSORS",
+        description="MongoDB线协议压缩算法，按优先级逗号分隔",
+    )
 
     # Redis缓存配置
     redis_uri: str = Field(
@@ -156,6 +178,28 @@ class AppSettings(BaseSettings):
         description="OpenAI文字转语音默认音频格式",
     )
 
+    # 向量化导入配置
+    embedding_batch_size: int = Field(
+        default=64,
+        env="EMBEDDING_BATCH_SIZE",
+        description="每次调用嵌入接口的文本数量",
+    )
+    embedding_max_concurrency: int = Field(
+        default=4,
+        env="EMBEDDING_MAX_CONCURRENCY",
+        description="同时进行的嵌入请求数量",
+    )
+    sub_vector_min_length: int = Field(
+        default=768,
+        env="SUB_VECTOR_MIN_LENGTH",
+        description="超过该字符数的数据才额外生成前512字符的子向量",
+    )
+    vector_insert_batch_size: int = Field(
+        default=1000,
+        env="VECTOR_INSERT_BATCH_SIZE",
+        description="每次写入Qdrant的向量数量",
+    )
+
     # 重排服务配置（默认不启用）
     rerank_service: str = Field(
         default="http://127.0.0.1:6006",
@@ -177,6 +221,13 @@ class AppSettings(BaseSettings):
         default=0.6, env="RELEVANCE_THRESHOLD", description="相关性阈值（0-1之间）"
     )
 
+    # 对话记忆配置
+    conversation_timeout_hours: int = Field(
+        default=24,
+        env="CONVERSATION_TIMEOUT_HOURS",
+        description="会话超时时间（小时），同时作为对话检索内容的保留时长",
+    )
+
     # LLM渠道配置已迁移到 llm_channels（YAML list），通过 get_llm_channels() 获取
 
     class Config:
@@ -7,10 +7,33 @@ from app.core.app import create_app
 app = create_app()
 
 
+def _server_impls() -> dict:
+    """优先使用 uvloop + httptools，Windows 开发环境缺包时回退到默认实现。"""
+    try:
+        import uvloop  # noqa: F401
+
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+
+    try:
+        import httptools  # noqa: F401
+
+        http = "httptools"
+    except ImportError:
+        http = "h11"
+
+    return {"loop": loop, "http": http}
+
+
 if __name__ == "__main__":
+    # 生产入口（deploy/Dockerfile 也从这里启动），不开 reload；本地开发用 run_dev.py
+    # worker 数只读 APP_WORKERS，默认1：任务列表、对话缓存仍在进程内
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
         port=app_config.app_port,
-        reload=app_config.debug,
+        workers=app_config.app_workers,
+        log_config=None,
+        **_server_impls(),
     )
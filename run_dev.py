@@ -0,0 +1,13 @@
+import uvicorn
+
+from config.settings import app_config
+
+if __name__ == "__main__":
+    # 本地开发：reload 模式下 uvicorn 只支持单 worker
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=app_config.app_port,
+        reload=True,
+        workers=1,
+    )
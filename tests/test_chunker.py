@@ -0,0 +1,114 @@
+"""chunker 单测：按token切块的合并、重叠、超长段落与序号 — 用逐字符编码替代 tiktoken，不联网。"""
+import random
+from unittest.mock import patch
+
+from app.ingestion.chunker import TokenAwareChunker
+
+
+class _CharEncoding:
+    """一个字符算一个token。"""
+
+    def encode(self, text: str) -> list[int]:
+        return [ord(char) for char in text]
+
+    def encode_batch(self, texts: list[str]) -> list[list[int]]:
+        return [self.encode(text) for text in texts]
+
+    def decode(self, token_ids: list[int]) -> str:
+        return "".join(chr(token_id) for token_id in token_ids)
+
+
+def _make_chunker(**kwargs) -> TokenAwareChunker:
+    with patch("app.ingestion.chunker.tiktoken.get_encoding", return_value=_CharEncoding()):
+        return TokenAwareChunker(**kwargs)
+
+
+def _reference_split(chunker: TokenAwareChunker, content: str) -> list[tuple[str, int, int]]:
+    """改用批量编码前的切分逻辑：每次用到token数都重新编码。"""
+    count = chunker.count_tokens
+    paragraphs = [part.strip() for part in content.splitlines() if part.strip()]
+    chunks: list[str] = []
+    current: list[str] = []
+    current_tokens = 0
+
+    for paragraph in paragraphs:
+        tokens = count(paragraph)
+        if tokens > chunker.max_tokens:
+            if current:
+                chunks.append("\n".join(current).strip())
+            current, current_tokens = [], 0
+            chunks.extend(chunker._split_large_text(paragraph))
+            continue
+
+        if current and current_tokens + tokens > chunker.target_tokens:
+            chunks.append("\n".join(current).strip())
+            overlap: list[str] = []
+            overlap_tokens = 0
+            for part in reversed(current):
+                if overlap_tokens + count(part) > chunker.overlap_tokens:
+                    break
+                overlap.insert(0, part)
+                overlap_tokens += count(part)
+            current, current_tokens = overlap, overlap_tokens
+
+        current.append(paragraph)
+        current_tokens += tokens
+
+    if current:
+        chunks.append("\n".join(current).strip())
+
+    return [
+        (chunk, index, count(chunk)) for index, chunk in enumerate(chunks) if chunk
+    ]
+
+
+def _as_tuples(chunks) -> list[tuple[str, int, int]]:
+    return [(chunk.content, chunk.index, chunk.tokens) for chunk in chunks]
+
+
+class TestSplit:
+
+    def setup_method(self):
+        self.chunker = _make_chunker(target_tokens=50, max_tokens=80, overlap_tokens=20)
+
+    def test_tail_paragraphs_overlap_next_chunk(self):
+        content = "\n".join(["a" * 30, "b" * 15, "c" * 30])
+        chunks = self.chunker.split(content)
+
+        assert [chunk.content for chunk in chunks] == [
+            "a" * 30 + "\n" + "b" * 15,
+            "b" * 15 + "\n" + "c" * 30,
+        ]
+
+    def test_large_paragraph_is_hard_split(self):
+        content = "\n".join(["a" * 10, "x" * 200, "b" * 10])
+        chunks = self.chunker.split(content)
+
+        assert chunks[0].content == "a" * 10
+        assert [len(chunk.content) for chunk in chunks[1:-1]] == [80, 80, 80, 20]
+        assert chunks[-1].content == "b" * 10
+        assert all(chunk.tokens <= self.chunker.max_tokens for chunk in chunks)
+
+    def test_indexes_are_contiguous(self):
+        content = "\n".join("p" * 25 for _ in range(10))
+        chunks = self.chunker.split(content)
+
+        assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+        assert all(chunk.tokens == len(chunk.content) for chunk in chunks)
+
+    def test_blank_content(self):
+        assert self.chunker.split("\n  \n") == []
+
+    def test_same_output_as_reference(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            paragraphs = [
+                rng.choice("abcdef") * rng.randint(1, 120)
+                for _ in range(rng.randint(0, 15))
+            ]
+            content = "\n".join(
+                paragraph if rng.random() > 0.1 else "  " for paragraph in paragraphs
+            )
+            assert _as_tuples(self.chunker.split(content)) == _reference_split(
+                self.chunker, content
+            )
@@ -0,0 +1,108 @@
+"""indexer 单测：向量任务构建与批量嵌入 — mock 掉嵌入模型和 Qdrant。"""
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.ingestion.indexer import EmbeddingIndexer
+from app.models.data_models import Data
+
+
+def _make_data(data_id: str, length: int) -> Data:
+    return Data(id=data_id, collection_id="c-1", content="字" * length)
+
+
+def _fake_embed(texts: list[str]) -> np.ndarray:
+    return np.array([[float(len(text))] for text in texts], dtype=np.float32)
+
+
+def _make_indexer(**kwargs) -> tuple[EmbeddingIndexer, MagicMock]:
+    store = MagicMock()
+    store.insert_vector_batch.return_value = True
+    return EmbeddingIndexer(store, **kwargs), store
+
+
+class TestBuildJobs:
+
+    def test_short_content_has_no_sub_vector(self):
+        indexer, _ = _make_indexer(sub_vector_min_length=768)
+        jobs = indexer._build_jobs([_make_data("d1", 600)])
+        assert [job.vector_type for job in jobs] == ["main"]
+
+    def test_long_content_has_sub_vector(self):
+        indexer, _ = _make_indexer(sub_vector_min_length=768)
+        jobs = indexer._build_jobs([_make_data("d1", 1000)])
+        assert [job.vector_type for job in jobs] == ["main", "sub"]
+        assert len(jobs[1].text) == 512
+
+    def test_vector_ids_stable_across_runs(self):
+        indexer, _ = _make_indexer(sub_vector_min_length=768)
+        data_list = [_make_data("d1", 1000)]
+        first = [job.id for job in indexer._build_jobs(data_list)]
+        second = [job.id for job in indexer._build_jobs(data_list)]
+        assert first == second
+        assert len(set(first)) == 2
+
+
+class TestIndexData:
+
+    def test_duplicate_texts_embedded_once(self):
+        indexer, _ = _make_indexer(batch_size=8)
+        data_list = [_make_data("d1", 10), _make_data("d2", 10)]
+
+        with patch("app.ingestion.indexer.embedding_manager") as manager:
+            manager.model = "test-model"
+            manager.embed_array.side_effect = _fake_embed
+            vector_map = indexer.index_data(data_list)
+
+        manager.embed_array.assert_called_once_with(["字" * 10])
+        assert len(vector_map["d1"]) == 1
+        assert len(vector_map["d2"]) == 1
+
+    def test_vectors_stay_aligned_with_jobs(self):
+        indexer, store = _make_indexer(batch_size=2, insert_batch_size=3)
+        data_list = [_make_data(f"d{i}", 10 + i) for i in range(5)]
+
+        inserted = []
+
+        def _record(ids, data_ids, vectors, model, wait):
+            inserted.append((data_ids, vectors))
+            return True
+
+        store.insert_vector_batch.side_effect = _record
+
+        with patch("app.ingestion.indexer.embedding_manager") as manager:
+            manager.model = "test-model"
+            manager.embed_array.side_effect = _fake_embed
+            indexer.index_data(data_list)
+
+        lengths = {data.id: float(len(data.content)) for data in data_list}
+        assert len(inserted) == 2
+        for data_ids, vectors in inserted:
+            assert vectors.shape == (len(data_ids), 1)
+            assert vectors[:, 0].tolist() == [lengths[data_id] for data_id in data_ids]
+
+    def test_only_last_insert_waits(self):
+        indexer, store = _make_indexer(batch_size=2, insert_batch_size=2)
+        data_list = [_make_data(f"d{i}", 10 + i) for i in range(5)]
+
+        with patch("app.ingestion.indexer.embedding_manager") as manager:
+            manager.model = "test-model"
+            manager.embed_array.side_effect = _fake_embed
+            indexer.index_data(data_list)
+
+        waits = [call.kwargs["wait"] for call in store.insert_vector_batch.call_args_list]
+        assert waits == [False, False, True]
+
+    def test_insert_failure_stops_embedding(self):
+        indexer, store = _make_indexer(batch_size=1, insert_batch_size=1, max_concurrency=1)
+        store.insert_vector_batch.return_value = False
+        data_list = [_make_data(f"d{i}", 10 + i) for i in range(10)]
+
+        with patch("app.ingestion.indexer.embedding_manager") as manager:
+            manager.model = "test-model"
+            manager.embed_array.side_effect = _fake_embed
+            with pytest.raises(RuntimeError):
+                indexer.index_data(data_list)
+
+        assert manager.embed_array.call_count <= 3
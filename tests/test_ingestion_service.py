@@ -0,0 +1,157 @@
+"""ingestion service 单测：目录导入流水线、重复导入与补齐未完成数据 — mock 掉存储和索引。"""
+import asyncio
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from app.ingestion.service import DataImportService
+from app.models.data_models import Collection, Data, Dataset
+
+
+def _make_service() -> DataImportService:
+    service = DataImportService.__new__(DataImportService)
+    service.mongo_store = MagicMock()
+    service.qdrant_store = MagicMock()
+    service.chunker = MagicMock()
+    service.indexer = MagicMock()
+    service.mongo_store.get_collection_by_name.return_value = Collection(
+        id="c-1", dataset_id="ds-1", name="doc", description="doc"
+    )
+    service.mongo_store.mark_processed.return_value = True
+    return service
+
+
+def _make_data(data_id: str, processed: bool) -> Data:
+    return Data(
+        id=data_id,
+        collection_id="c-1",
+        content="内容",
+        metadata={"processed": processed},
+    )
+
+
+class TestImportDocument:
+
+    def setup_method(self):
+        self.service = _make_service()
+        self.dataset = Dataset(id="ds-1", name="知识库", description="知识库")
+
+    def test_processed_file_is_skipped(self):
+        self.service.mongo_store.get_data_by_collection.return_value = [
+            _make_data("d1", processed=True)
+        ]
+
+        result = self.service._import_document(Path("doc.txt"), "内容", self.dataset)
+
+        assert result["vectors_created"] == 0
+        self.service.chunker.split.assert_not_called()
+        self.service.indexer.index_data.assert_not_called()
+
+    def test_only_pending_data_is_indexed(self):
+        done, pending = _make_data("d1", processed=True), _make_data("d2", processed=False)
+        self.service.mongo_store.get_data_by_collection.return_value = [done, pending]
+        self.service.indexer.index_data.return_value = {"d2": ["v1", "v2"]}
+
+        result = self.service._import_document(Path("doc.txt"), "内容", self.dataset)
+
+        self.service.indexer.index_data.assert_called_once_with([pending])
+        self.service.chunker.split.assert_not_called()
+        self.service.mongo_store.bulk_create_data.assert_not_called()
+        assert result == {"success": True, "data_created": 0, "vectors_created": 2}
+        assert pending.metadata["processed"] is True
+        self.service.mongo_store.mark_processed.assert_called_once_with(
+            {"d2": ["v1", "v2"]}
+        )
+
+
+class TestProcessPendingData:
+
+    def test_pending_rows_indexed_in_slices(self, monkeypatch):
+        service = _make_service()
+        monkeypatch.setattr("app.ingestion.service.PENDING_FLUSH_SIZE", 2)
+        rows = [_make_data(f"d{i}", processed=False) for i in range(5)]
+        service.mongo_store.get_pending_data_batch.side_effect = lambda limit: [
+            data for data in rows if not data.metadata["processed"]
+        ][:limit]
+        service.indexer.index_data.side_effect = lambda batch: {
+            data.id: [f"v-{data.id}"] for data in batch
+        }
+
+        asyncio.run(service._process_pending_data())
+
+        sizes = [len(call.args[0]) for call in service.indexer.index_data.call_args_list]
+        assert sizes == [2, 2, 1]
+        assert service.mongo_store.mark_processed.call_count == 3
+
+
+class TestImportDirectory:
+
+    def setup_method(self):
+        self.service = _make_service()
+        self.service.reader = MagicMock()
+        self.service.reader.list_files.return_value = [
+            Path("a.txt"), Path("b.txt"), Path("c.txt")
+        ]
+        self.service._get_or_create_dataset = MagicMock(
+            return_value=Dataset(id="ds-1", name="知识库", description="知识库")
+        )
+        self.service._import_document = MagicMock(
+            return_value={"success": True, "data_created": 2, "vectors_created": 3}
+        )
+
+    def _run(self) -> dict:
+        return asyncio.run(asyncio.wait_for(self.service.import_directory("./data"), 5))
+
+    def test_reader_failure_still_sends_sentinel(self):
+        self.service.reader.read_file.side_effect = ["内容a", OSError("disk")]
+        dataset = self.service._get_or_create_dataset.return_value
+        result = {"files_processed": 0, "data_created": 0, "vectors_created": 0}
+
+        async def _pipeline():
+            queue = asyncio.Queue(maxsize=2)
+            return await asyncio.gather(
+                self.service._read_documents(self.service.reader.list_files(), queue),
+                self.service._import_queued_documents(queue, dataset, result),
+                return_exceptions=True,
+            )
+
+        # 没有结束标记时消费端会一直等待，wait_for 超时
+        read_error, _ = asyncio.run(asyncio.wait_for(_pipeline(), 5))
+
+        assert isinstance(read_error, OSError)
+        assert result["files_processed"] == 1
+
+    def test_reader_failure_fails_import(self):
+        self.service.reader.read_file.side_effect = OSError("disk")
+
+        result = self._run()
+
+        assert result["success"] is False
+        assert result["error"] == "disk"
+        self.service._import_document.assert_not_called()
+
+    def test_failed_file_skipped_and_rest_imported(self):
+        self.service.reader.read_file.side_effect = ["内容a", "内容b", "内容c"]
+        self.service._import_document.side_effect = [
+            {"success": True, "data_created": 2, "vectors_created": 3},
+            RuntimeError("mongo down"),
+            {"success": True, "data_created": 4, "vectors_created": 5},
+        ]
+
+        result = self._run()
+
+        imported = [call.args[0].name for call in self.service._import_document.call_args_list]
+        assert imported == ["a.txt", "b.txt", "c.txt"]
+        assert result["success"] is True
+        assert result["files_processed"] == 2
+        assert result["data_created"] == 6
+        assert result["vectors_created"] == 8
+
+    def test_unreadable_file_not_counted(self):
+        self.service.reader.read_file.side_effect = ["内容a", None, "内容c"]
+
+        result = self._run()
+
+        assert self.service._import_document.call_count == 2
+        assert result["files_processed"] == 2
+        assert result["data_created"] == 4
+        assert result["vectors_created"] == 6
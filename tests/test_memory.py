@@ -0,0 +1,42 @@
+"""memory 单测：对话轮次写入路径 — mock 掉 mongo_store，不依赖数据库。"""
+from unittest.mock import patch
+
+from app.models.data_models import RerankResult
+from app.rag.memory import ConversationMemory
+
+
+def _make_result(data_id: str) -> RerankResult:
+    return RerankResult(
+        data_id=data_id,
+        collection_id="test-collection-id",
+        content=f"内容-{data_id}",
+        original_score=0.8,
+        rerank_score=0.8,
+        final_score=0.8,
+    )
+
+
+class TestAddConversationTurn:
+
+    def setup_method(self):
+        self.memory = ConversationMemory()
+
+    def test_turn_only_keeps_chunk_refs(self):
+        chunks = [_make_result("d1"), _make_result("d2")]
+        with patch("app.rag.memory.mongo_store") as store:
+            store.save_turn_chunks.return_value = ["ref-0", "ref-1"]
+            turn_id = self.memory.add_conversation_turn(
+                session_id="s-1", question="q", answer="a", retrieved_chunks=chunks,
+            )
+
+        assert turn_id
+        store.save_turn_chunks.assert_called_once_with(turn_id, chunks)
+        turn = store.save_conversation_turn.call_args.args[0]
+        assert turn.chunk_refs == ["ref-0", "ref-1"]
+        assert "retrieved_chunks" not in turn.model_dump()
+
+    def test_no_chunks_skips_chunk_write(self):
+        with patch("app.rag.memory.mongo_store") as store:
+            self.memory.add_conversation_turn(session_id="s-2", question="q", answer="a")
+
+        store.save_turn_chunks.assert_not_called()
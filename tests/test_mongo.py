@@ -0,0 +1,132 @@
+"""mongo 单测：进程内共享客户端、字段投影、索引创建、分段$in查询、写库文档与游标遍历 — 不连接数据库。"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+from pymongo.errors import CursorNotFound, OperationFailure
+
+from app.models.data_models import Data
+from app.stores.mongo import MongoClientPool, MongoMetadataStore, _projection
+
+
+class TestMongoClientPool:
+
+    def test_same_process_shares_client(self):
+        pool = MongoClientPool()
+        with patch("app.stores.mongo.MongoClient") as client_cls:
+            first = pool.get("mongodb://db/a")
+            second = pool.get("mongodb://db/a")
+        assert first is second
+        client_cls.assert_called_once()
+
+    def test_forked_process_gets_new_client(self):
+        pool = MongoClientPool()
+        with patch("app.stores.mongo.MongoClient") as client_cls:
+            client_cls.side_effect = lambda *args, **kwargs: object()
+            with patch("app.stores.mongo.os.getpid", return_value=1):
+                parent = pool.get("mongodb://db/a")
+            with patch("app.stores.mongo.os.getpid", return_value=2):
+                child = pool.get("mongodb://db/a")
+        assert parent is not child
+        assert client_cls.call_count == 2
+
+
+class TestProjection:
+
+    def test_default_excludes_only_id(self):
+        assert _projection() == {"_id": 0}
+
+    def test_fields_are_included(self):
+        assert _projection(["id", "content"]) == {"_id": 0, "id": 1, "content": 1}
+
+
+class TestCreateIndexes:
+
+    def test_one_call_per_collection_and_failures_isolated(self):
+        store = MongoMetadataStore()
+        names = ["datasets", "collections", "data", "conversations", "chunks_by_turn"]
+        store._collections = {name: MagicMock() for name in names}
+        store._collections["data"].create_indexes.side_effect = RuntimeError("conflict")
+
+        store._create_indexes()
+
+        for name in names:
+            store._collections[name].create_indexes.assert_called_once()
+
+
+    def test_ttl_conflict_updated_without_blocking_unique_indexes(self):
+        store = MongoMetadataStore()
+        names = ["datasets", "collections", "data", "conversations", "chunks_by_turn"]
+        store._collections = {name: MagicMock() for name in names}
+        chunks = store._collections["chunks_by_turn"]
+        chunks.create_index.side_effect = OperationFailure("conflict", code=85)
+
+        store._create_indexes()
+
+        unique_keys = [index.document["key"] for index in chunks.create_indexes.call_args.args[0]]
+        assert unique_keys == [{"id": 1}, {"turn_id": 1, "index": 1}]
+        command = chunks.database.command.call_args
+        assert command.args == ("collMod", "chunks_by_turn")
+        assert command.kwargs["index"]["keyPattern"] == {"created_at": 1}
+
+
+class TestFindDataIn:
+
+    def test_large_in_is_chunked_and_deduplicated(self, monkeypatch):
+        monkeypatch.setattr("app.stores.mongo.IN_QUERY_CHUNK_SIZE", 2)
+        store = MongoMetadataStore()
+        collection = MagicMock()
+        store._collections = {"data": collection}
+        # d1 的两个向量落在不同分段里
+        row = {"id": "d1", "collection_id": "c-1", "content": "内容"}
+        collection.find.return_value.batch_size.side_effect = [[row], [dict(row)]]
+
+        data_list = store.get_data_by_vector_ids(["v1", "v2", "v3", "v2"])
+
+        queried = [call.args[0]["vector_ids"]["$in"] for call in collection.find.call_args_list]
+        assert queried == [["v1", "v2"], ["v3"]]
+        assert [data.id for data in data_list] == ["d1"]
+
+
+class TestBsonDict:
+
+    def test_matches_model_dump(self):
+        data = Data(
+            id="d1", collection_id="c-1", content="内容",
+            vector_ids=["v1"], metadata={"processed": False},
+        )
+        assert data.to_bson_dict() == data.model_dump()
+
+    def test_insert_does_not_touch_model(self):
+        store = MongoMetadataStore()
+        collection = MagicMock()
+        store._collections = {"data": collection}
+        # insert_many 会往文档里写 _id，写入的必须是副本
+        collection.insert_many.side_effect = lambda docs, ordered: [
+            doc.setdefault("_id", "oid") for doc in docs
+        ]
+        data = Data(id="d1", collection_id="c-1", content="内容")
+
+        assert store.bulk_create_data([data])
+        assert "_id" not in data.to_bson_dict()
+        data.vector_ids.append("v1")
+        assert data.to_bson_dict()["vector_ids"] == ["v1"]
+
+
+class TestIterData:
+
+    def test_cursor_error_propagates(self):
+        store = MongoMetadataStore()
+        collection = MagicMock()
+        store._collections = {"data": collection}
+        row = {"id": "d1", "collection_id": "c-1", "content": "内容"}
+
+        def _cursor():
+            yield row
+            raise CursorNotFound("cursor id not found")
+
+        collection.find.return_value.batch_size.return_value = _cursor()
+
+        iterator = store.iter_data_by_collection("c-1")
+        assert next(iterator).id == "d1"
+        with pytest.raises(CursorNotFound):
+            next(iterator)
@@ -0,0 +1,66 @@
+"""qdrant 单测：批量导入模式的索引阈值切换 — mock 掉 QdrantClient。"""
+from unittest.mock import MagicMock
+
+from app.stores.qdrant import DEFAULT_INDEXING_THRESHOLD, QdrantVectorStore
+
+
+def _make_store(threshold: int | None) -> QdrantVectorStore:
+    store = QdrantVectorStore()
+    store.client = MagicMock()
+    info = store.client.get_collection.return_value
+    info.config.optimizer_config.indexing_threshold = threshold
+    return store
+
+
+def _thresholds(store: QdrantVectorStore) -> list[int]:
+    return [
+        call.kwargs["optimizers_config"].indexing_threshold
+        for call in store.client.update_collection.call_args_list
+    ]
+
+
+class TestBulkImportMode:
+
+    def test_threshold_restored_after_import(self):
+        store = _make_store(threshold=10000)
+        with store.bulk_import_mode():
+            assert _thresholds(store) == [0]
+        assert _thresholds(store) == [0, 10000]
+
+    def test_threshold_restored_on_error(self):
+        store = _make_store(threshold=20000)
+        try:
+            with store.bulk_import_mode():
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert _thresholds(store) == [0, 20000]
+
+    def test_null_threshold_restores_default(self):
+        store = _make_store(threshold=None)
+        with store.bulk_import_mode():
+            pass
+        assert _thresholds(store) == [0, DEFAULT_INDEXING_THRESHOLD]
+
+    def test_zero_threshold_left_by_killed_import_restores_default(self):
+        store = _make_store(threshold=0)
+        with store.bulk_import_mode():
+            pass
+        assert _thresholds(store) == [0, DEFAULT_INDEXING_THRESHOLD]
+
+    def test_nested_imports_restore_once(self):
+        store = _make_store(threshold=20000)
+        with store.bulk_import_mode():
+            # 内层进入时集合已是0，不能把0当作原值恢复
+            store.client.get_collection.return_value.config.optimizer_config.indexing_threshold = 0
+            with store.bulk_import_mode():
+                pass
+            assert _thresholds(store) == [0]
+        assert _thresholds(store) == [0, 20000]
+
+    def test_pause_failure_skips_restore(self):
+        store = _make_store(threshold=20000)
+        store.client.update_collection.side_effect = RuntimeError("unavailable")
+        with store.bulk_import_mode():
+            pass
+        store.client.update_collection.assert_called_once()
@@ -0,0 +1,60 @@
+"""readers 单测：文本文件编码识别 — 只读本地临时文件。"""
+import codecs
+
+from app.ingestion.readers import FileReader
+
+TEXT = "你好，世界。这是一个测试文件，包含中文内容。" * 20
+# 候选编码都解不开，只能靠探测
+CP1251_TEXT = "Привет, мир. Это тестовый файл на русском языке. " * 10
+
+
+class TestReadText:
+
+    def setup_method(self):
+        self.reader = FileReader()
+
+    def test_utf8(self, tmp_path):
+        path = tmp_path / "utf8.txt"
+        path.write_bytes(TEXT.encode("utf-8"))
+        assert self.reader.read_file(path) == TEXT
+
+    def test_utf8_bom_stripped(self, tmp_path):
+        path = tmp_path / "bom.txt"
+        path.write_bytes(codecs.BOM_UTF8 + TEXT.encode("utf-8"))
+        assert self.reader.read_file(path) == TEXT
+
+    def test_utf16_bom(self, tmp_path):
+        path = tmp_path / "utf16.txt"
+        path.write_bytes(TEXT.encode("utf-16"))
+        assert self.reader.read_file(path) == TEXT
+
+    def test_broken_utf16_bom_not_replaced(self, tmp_path):
+        # 带BOM但数据被截断，严格解码失败后不能返回带替换字符的内容
+        path = tmp_path / "broken.txt"
+        path.write_bytes(codecs.BOM_UTF16_LE + "你好".encode("utf-16-le") + b"\x00")
+        assert self.reader.read_file(path) is None
+
+    def test_gbk_detected(self, tmp_path):
+        path = tmp_path / "gbk.txt"
+        path.write_bytes(TEXT.encode("gbk"))
+        assert self.reader.read_file(path) == TEXT
+
+    def test_short_gbk_not_misdetected(self, tmp_path):
+        # 探测器会把这两段短文本判成 big5 / cp949
+        for index, text in enumerate(["价格：100元", "你好世界"]):
+            path = tmp_path / f"short{index}.txt"
+            path.write_bytes(text.encode("gbk"))
+            assert self.reader.read_file(path) == text
+
+    def test_detection_is_fallback_only(self, tmp_path):
+        path = tmp_path / "cp1251.txt"
+        path.write_bytes(CP1251_TEXT.encode("cp1251"))
+        assert self.reader.read_file(path) == CP1251_TEXT
+
+    def test_mixed_encodings_in_one_directory(self, tmp_path):
+        # big5 文件在前；后面的短 GBK 文件也能被 big5 严格解码，但必须按候选顺序用 gbk
+        (tmp_path / "a.txt").write_bytes("這是一個測試檔案x".encode("big5"))
+        (tmp_path / "b.txt").write_bytes("价格：100元".encode("gbk"))
+
+        assert self.reader.read_file(tmp_path / "a.txt") == "這是一個測試檔案x"
+        assert self.reader.read_file(tmp_path / "b.txt") == "价格：100元"